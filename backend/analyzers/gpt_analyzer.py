@@ -1,15 +1,54 @@
 import openai
+import asyncio
+import functools
 import json
 import logging
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
+from pydantic import BaseModel, ValidationError as PydanticValidationError
+
 from ..models import RawTool, AnalyzedTool, GPTAnalysisResponse
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
 
+class _AnalyzedRow(BaseModel):
+    """GPT返回的单条分析结果（仅校验字段是否齐全）"""
+    tool_name: str
+    category: str
+    trend_signal: str
+    pain_point: str
+    micro_saas_ideas: Any = []
+
+
+class _GPTPayload(BaseModel):
+    """GPT返回的完整响应"""
+    analyzed_tools: List[Dict[str, Any]] = []
+
+
+# 每个token的单价（美元）: (输入, 输出)，GPT-4o定价 (2024年1月)
+_MODEL_RATES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o": (0.005 / 1000, 0.015 / 1000),
+}
+_DEFAULT_RATES = _MODEL_RATES["gpt-4o"]
+
+# 假设输入token占70%，输出token占30%
+_INPUT_RATIO = 0.7
+_OUTPUT_RATIO = 0.3
+
+# 同步的OpenAI客户端调用放到有界线程池中执行，避免阻塞事件循环
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="gpt-analyzer")
+
+
+async def _asyncify(fn, *args, **kwargs):
+    """在线程池中执行同步函数"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_EXECUTOR, functools.partial(fn, *args, **kwargs))
+
+
 class GPTAnalyzer:
     """GPT分析器"""
 
@@ -21,6 +60,7 @@ class GPTAnalyzer:
             "Education", "Audio", "Other"
         ]
         self.trend_signals = ["Rising", "Stable", "Declining"]
+        self._in_rate, self._out_rate = _MODEL_RATES.get(self.model, _DEFAULT_RATES)
 
     async def analyze_tools(self, tools: List[RawTool]) -> List[AnalyzedTool]:
         """分析工具列表"""
@@ -102,7 +142,8 @@ class GPTAnalyzer:
     async def _call_gpt_analysis(self, prompt: str) -> str:
         """调用GPT分析API"""
         try:
-            response = self.client.chat.completions.create(
+            response = await _asyncify(
+                self.client.chat.completions.create,
                 model=self.model,
                 messages=[
                     {
@@ -139,41 +180,46 @@ class GPTAnalyzer:
                 response = response[:-3]
             response = response.strip()
 
-            data = json.loads(response)
+            # JSON解码和结构校验由pydantic-core一次完成
+            payload = _GPTPayload.model_validate_json(response)
             analyzed_tools = []
 
-            for item in data.get("analyzed_tools", []):
+            for item in payload.analyzed_tools:
                 # 验证必要字段
-                if not all(key in item for key in ["tool_name", "category", "trend_signal", "pain_point"]):
+                try:
+                    row = _AnalyzedRow.model_validate(item)
+                except PydanticValidationError:
                     logger.warning(f"跳过不完整的分析结果: {item}")
                     continue
 
                 # 验证枚举值
-                if item["category"] not in self.categories:
-                    logger.warning(f"无效的类别: {item['category']}")
-                    item["category"] = "Other"
+                category = row.category
+                if category not in self.categories:
+                    logger.warning(f"无效的类别: {category}")
+                    category = "Other"
 
-                if item["trend_signal"] not in self.trend_signals:
-                    logger.warning(f"无效的趋势信号: {item['trend_signal']}")
-                    item["trend_signal"] = "Stable"
+                trend_signal = row.trend_signal
+                if trend_signal not in self.trend_signals:
+                    logger.warning(f"无效的趋势信号: {trend_signal}")
+                    trend_signal = "Stable"
 
                 # 确保ideas是列表
-                ideas = item.get("micro_saas_ideas", [])
+                ideas = row.micro_saas_ideas
                 if not isinstance(ideas, list):
                     ideas = [str(ideas)]
 
                 analyzed_tool = AnalyzedTool(
-                    tool_name=item["tool_name"],
-                    category=item["category"],
-                    trend_signal=item["trend_signal"],
-                    pain_point=item["pain_point"],
+                    tool_name=row.tool_name,
+                    category=category,
+                    trend_signal=trend_signal,
+                    pain_point=row.pain_point,
                     micro_saas_ideas=ideas[:3]  # 限制最多3个点子
                 )
                 analyzed_tools.append(analyzed_tool)
 
             return analyzed_tools
 
-        except json.JSONDecodeError as e:
+        except PydanticValidationError as e:
             logger.error(f"GPT响应JSON解析失败: {e}")
             logger.error(f"原始响应: {response}")
             return []
@@ -183,16 +229,10 @@ class GPTAnalyzer:
 
     def calculate_cost(self, tokens_used: int) -> float:
         """计算API成本（以美元为单位）"""
-        # GPT-4o定价 (2024年1月)
-        input_price = 0.005  # per 1K input tokens
-        output_price = 0.015  # per 1K output tokens
-
-        # 假设输入token占70%，输出token占30%
-        input_tokens = int(tokens_used * 0.7)
-        output_tokens = int(tokens_used * 0.3)
+        input_tokens = int(tokens_used * _INPUT_RATIO)
+        output_tokens = int(tokens_used * _OUTPUT_RATIO)
 
-        cost = (input_tokens * input_price / 1000) + (output_tokens * output_price / 1000)
-        return round(cost, 4)
+        return round(input_tokens * self._in_rate + output_tokens * self._out_rate, 4)
 
     async def analyze_batch(self, tools_batch: List[RawTool]) -> Dict[str, Any]:
         """批量分析工具"""
@@ -32,6 +32,9 @@ class Settings(BaseSettings):
         "https://news.ycombinator.com/rss"
     ]
 
+    # 抓取并发上限（所有社媒抓取器共享）
+    SCRAPE_CONCURRENCY: int = 16
+
     # Reddit 配置
     REDDIT_CLIENT_ID: Optional[str] = None
     REDDIT_CLIENT_SECRET: Optional[str] = None
@@ -41,9 +44,12 @@ class Settings(BaseSettings):
     CRON_SCHEDULE: str = "0 9 * * *"  # 每天上午9点
     DATA_SOURCE_LIMIT: int = 50
     ANALYSIS_BATCH_SIZE: int = 10
+    ANALYSIS_CONCURRENCY: int = 4
 
     # 缓存配置
     CACHE_TTL: int = 3600  # 1小时
+    ENABLE_ANALYSIS_CACHE: bool = True
+    ANALYSIS_CACHE_TTL_DAYS: int = 30
     REDIS_URL: Optional[str] = None
 
     # 日志配置
@@ -1,6 +1,6 @@
 import logging
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import datetime, timedelta
 import asyncpg
 from supabase import create_client, Client
 
@@ -15,16 +15,25 @@ class DatabaseManager:
 
     def __init__(self):
         self.supabase: Optional[Client] = None
+        # 健康检查专用客户端，拥有独立的连接池，避免被业务查询阻塞
+        self.health_supabase: Optional[Client] = None
         self.pool: Optional[asyncpg.pool.Pool] = None
 
     async def initialize(self):
-        """初始化数据库连接"""
+        """初始化数据库连接（重复调用时复用已有客户端）"""
+        if self.supabase is not None:
+            return
+
         try:
             # 初始化 Supabase 客户端
             self.supabase = create_client(
                 supabase_url=settings.SUPABASE_URL,
                 supabase_key=settings.SUPABASE_KEY
             )
+            self.health_supabase = create_client(
+                supabase_url=settings.SUPABASE_URL,
+                supabase_key=settings.SUPABASE_KEY
+            )
             logger.info("Supabase 客户端初始化成功")
 
             # 这里也可以初始化 PostgreSQL 连接池用于复杂查询
@@ -42,6 +51,9 @@ class DatabaseManager:
         """关闭数据库连接"""
         if self.pool:
             await self.pool.close()
+            self.pool = None
+        self.supabase = None
+        self.health_supabase = None
         logger.info("数据库连接已关闭")
 
     # ==================== 工具数据操作 ====================
@@ -266,6 +278,59 @@ class DatabaseManager:
             logger.error(f"批量插入工具失败: {e}")
             raise
 
+    async def save_scan_results(self, tools_data: List[Dict[str, Any]], log_data: Dict[str, Any]) -> int:
+        """在同一事务中批量写入工具数据和分析日志，返回写入的工具数"""
+        try:
+            for tool in tools_data:
+                if isinstance(tool.get('date'), datetime):
+                    tool['date'] = tool['date'].isoformat()
+
+            response = self.supabase.rpc(
+                "save_scan_results",
+                {"tools": tools_data, "log": log_data}
+            ).execute()
+
+            return response.data or 0
+
+        except Exception as e:
+            logger.error(f"保存扫描结果失败: {e}")
+            raise
+
+    async def get_cached_analyses(self, hashes: List[str], ttl_days: int) -> Dict[str, Dict[str, Any]]:
+        """按哈希批量读取未过期的GPT分析缓存"""
+        if not hashes:
+            return {}
+
+        try:
+            since = (datetime.utcnow() - timedelta(days=ttl_days)).isoformat()
+            response = self.supabase.table("analysis_cache")\
+                .select("hash, response")\
+                .in_("hash", hashes)\
+                .gte("created_at", since)\
+                .execute()
+
+            return {item["hash"]: item["response"] for item in response.data}
+
+        except Exception as e:
+            logger.warning(f"读取分析缓存失败: {e}")
+            return {}
+
+    async def save_cached_analyses(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """批量写入GPT分析缓存"""
+        if not entries:
+            return
+
+        try:
+            now = datetime.utcnow().isoformat()
+            rows = [
+                {"hash": h, "response": response, "created_at": now}
+                for h, response in entries.items()
+            ]
+            self.supabase.table("analysis_cache").upsert(rows).execute()
+
+        except Exception as e:
+            logger.warning(f"写入分析缓存失败: {e}")
+
     async def is_refreshing(self) -> bool:
         """检查是否正在刷新数据"""
         try:
@@ -366,8 +431,8 @@ class DatabaseManager:
     async def health_check(self) -> bool:
         """数据库健康检查"""
         try:
-            # 简单的查询测试
-            response = self.supabase.table("tools").select("id").limit(1).execute()
+            # 简单的查询测试，使用独立客户端
+            response = self.health_supabase.table("tools").select("id").limit(1).execute()
             return True
 
         except Exception as e:
@@ -12,6 +12,7 @@ class AnalysisRequest(BaseModel):
 class AnalysisResponse(BaseModel):
     """分析响应模型"""
     analyzed_tools: List[AnalyzedTool] = Field(..., description="分析后的工具数据")
+    input_indices: List[Optional[int]] = Field(default_factory=list, description="每条分析结果对应的输入下标，无法对应时为None")
     total_processed: int = Field(..., description="处理总数")
     tokens_used: Optional[int] = Field(None, description="使用的Token数量")
     cost_usd: Optional[float] = Field(None, description="成本（美元）")
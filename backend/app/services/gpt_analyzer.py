@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import json
 import time
@@ -59,6 +60,7 @@ class GPTAnalyzer:
 {{
   "analyzed_tools": [
     {{
+      "id": 0,
       "tool_name": "工具名称",
       "category": "分类",
       "trend_signal": "趋势信号",
@@ -75,6 +77,7 @@ class GPTAnalyzer:
 3. 趋势信号必须是Rising、Stable或Declining之一
 4. 痛点描述要具体，避免空泛
 5. Micro SaaS点子要具有可操作性，是独立开发者可以实现的
+6. 每条结果的id必须与对应输入数据的id一致
 """
 
     async def analyze_tools(self, raw_tools: List[RawToolData]) -> AnalysisResponse:
@@ -84,25 +87,41 @@ class GPTAnalyzer:
         start_time = time.time()
         total_processed = 0
         analyzed_tools = []
+        input_indices = []
         tokens_used = 0
 
         # 分批处理，避免超过token限制
         batch_size = settings.ANALYSIS_BATCH_SIZE
         batches = [raw_tools[i:i + batch_size] for i in range(0, len(raw_tools), batch_size)]
 
-        for i, batch in enumerate(batches):
-            logger.info(f"正在处理第 {i + 1}/{len(batches)} 批数据...")
+        # 并发分析各批次，用信号量限制同时在途的API请求数
+        semaphore = asyncio.Semaphore(settings.ANALYSIS_CONCURRENCY)
 
-            try:
-                batch_result = await self._analyze_batch(batch)
-                analyzed_tools.extend(batch_result.analyzed_tools)
-                total_processed += len(batch)
-                tokens_used += batch_result.tokens_used or 0
+        async def run_batch(i: int, batch: List[RawToolData]) -> AnalysisResponse:
+            async with semaphore:
+                logger.info(f"正在处理第 {i + 1}/{len(batches)} 批数据...")
+                return await self._analyze_batch(batch)
 
-            except Exception as e:
-                logger.error(f"分析第 {i + 1} 批数据失败: {e}")
+        results = await asyncio.gather(
+            *(run_batch(i, batch) for i, batch in enumerate(batches)),
+            return_exceptions=True
+        )
+
+        for i, (batch, batch_result) in enumerate(zip(batches, results)):
+            if isinstance(batch_result, Exception):
+                logger.error(f"分析第 {i + 1} 批数据失败: {batch_result}")
                 continue
 
+            # 批内下标换算为raw_tools中的下标
+            offset = i * batch_size
+            analyzed_tools.extend(batch_result.analyzed_tools)
+            input_indices.extend(
+                None if index is None else offset + index
+                for index in batch_result.input_indices
+            )
+            total_processed += len(batch)
+            tokens_used += batch_result.tokens_used or 0
+
         processing_time = time.time() - start_time
         cost_usd = self._calculate_cost(tokens_used)
 
@@ -110,6 +129,7 @@ class GPTAnalyzer:
 
         return AnalysisResponse(
             analyzed_tools=analyzed_tools,
+            input_indices=input_indices,
             total_processed=total_processed,
             tokens_used=tokens_used,
             cost_usd=cost_usd,
@@ -124,8 +144,9 @@ class GPTAnalyzer:
         """分析一批工具数据"""
         # 准备输入数据
         tools_data = []
-        for tool in tools:
+        for i, tool in enumerate(tools):
             tools_data.append({
+                "id": i,
                 "tool_name": tool.tool_name,
                 "description": tool.description,
                 "votes": tool.votes,
@@ -163,6 +184,7 @@ class GPTAnalyzer:
 
             # 转换为AnalyzedTool对象
             analyzed_tools = []
+            input_indices = []
             for tool_data in analysis_result.get("analyzed_tools", []):
                 try:
                     analyzed_tool = AnalyzedTool(
@@ -173,12 +195,14 @@ class GPTAnalyzer:
                         micro_saas_ideas=tool_data["micro_saas_ideas"]
                     )
                     analyzed_tools.append(analyzed_tool)
+                    input_indices.append(self._match_input(tool_data, tools, input_indices))
                 except Exception as e:
                     logger.warning(f"解析工具数据失败: {e}, 数据: {tool_data}")
                     continue
 
             return AnalysisResponse(
                 analyzed_tools=analyzed_tools,
+                input_indices=input_indices,
                 total_processed=len(tools),
                 tokens_used=response.usage.total_tokens,
                 cost_usd=self._calculate_cost(response.usage.total_tokens),
@@ -192,6 +216,17 @@ class GPTAnalyzer:
             logger.error(f"GPT分析失败: {e}")
             raise
 
+    @staticmethod
+    def _match_input(tool_data: Dict, tools: List[RawToolData], used: List[Optional[int]]) -> Optional[int]:
+        """找出分析结果对应的输入下标：优先使用回传的id，否则按名称匹配第一个未使用的输入"""
+        index = tool_data.get("id")
+        if isinstance(index, int) and 0 <= index < len(tools) and index not in used:
+            return index
+        for i, tool in enumerate(tools):
+            if i not in used and tool.tool_name == tool_data["tool_name"]:
+                return i
+        return None
+
     def _calculate_cost(self, tokens: int) -> float:
         """计算API调用成本（美元）"""
         # GPT-4o 定价 (2024年1月)
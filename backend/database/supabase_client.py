@@ -1,6 +1,7 @@
 from supabase import create_client, Client
 from typing import List, Optional, Dict, Any
 import logging
+from collections import Counter
 from datetime import datetime
 
 from ..models import Tool, AnalysisLog
@@ -158,10 +159,7 @@ class SupabaseDB:
                 .select("category", count="exact")
                 .execute()
             )
-            category_stats = {}
-            for item in category_result.data:
-                category = item["category"]
-                category_stats[category] = category_stats.get(category, 0) + 1
+            category_stats = dict(Counter(item["category"] for item in category_result.data))
 
             # 按趋势信号统计
             trend_result = (
@@ -169,10 +167,7 @@ class SupabaseDB:
                 .select("trend_signal", count="exact")
                 .execute()
             )
-            trend_stats = {}
-            for item in trend_result.data:
-                trend = item["trend_signal"]
-                trend_stats[trend] = trend_stats.get(trend, 0) + 1
+            trend_stats = dict(Counter(item["trend_signal"] for item in trend_result.data))
 
             return {
                 "total_tools": total_tools,
@@ -13,16 +13,17 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 from config import settings
-from utils.logger import get_logger
+from utils.logger import get_logger, install as install_logging
 
 logger = get_logger(__name__)
 
 
 def main():
     """启动FastAPI服务器"""
+    install_logging()
     logger.info("正在启动 AutoSaaS Radar 后端服务...")
-    logger.info(f"服务地址: http://{settings.api_host}:{settings.api_port}")
-    logger.info(f"调试模式: {settings.debug}")
+    logger.info("服务地址: http://%s:%s", settings.api_host, settings.api_port)
+    logger.info("调试模式: %s", settings.debug)
 
     try:
         uvicorn.run(
@@ -35,7 +36,7 @@ def main():
     except KeyboardInterrupt:
         logger.info("服务已停止")
     except Exception as e:
-        logger.error(f"启动服务失败: {e}")
+        logger.error("启动服务失败: %s", e)
         sys.exit(1)
 
 
@@ -14,8 +14,11 @@ logger = logging.getLogger(__name__)
 class HackerNewsScraper:
     """Hacker News 抓取器 - 从Hacker News抓取AI/SaaS相关内容"""
 
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
         self.session = None
+        self.transport = transport
+        # 限制并发HTTP请求数，可由SocialMediaCollector替换为共享信号量
+        self.semaphore = asyncio.Semaphore(settings.SCRAPE_CONCURRENCY)
         self.base_url = "https://hacker-news.firebaseio.com/v0"
         self.web_url = "https://news.ycombinator.com"
         self.keywords = [
@@ -30,8 +33,14 @@ class HackerNewsScraper:
     async def initialize(self):
         """初始化HTTP客户端"""
         try:
+            # 故事详情并发抓取，连接池大小与并发上限保持一致以复用连接
             self.session = httpx.AsyncClient(
                 timeout=30.0,
+                transport=self.transport,
+                limits=httpx.Limits(
+                    max_connections=settings.SCRAPE_CONCURRENCY,
+                    max_keepalive_connections=settings.SCRAPE_CONCURRENCY
+                ),
                 headers={
                     "User-Agent": settings.REDDIT_USER_AGENT
                 }
@@ -86,7 +95,8 @@ class HackerNewsScraper:
     async def _get_new_stories(self) -> List[int]:
         """获取最新故事ID列表"""
         try:
-            response = await self.session.get(f"{self.base_url}/newstories.json")
+            async with self.semaphore:
+                response = await self.session.get(f"{self.base_url}/newstories.json")
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -96,7 +106,8 @@ class HackerNewsScraper:
     async def _get_story_details(self, story_id: int) -> Optional[Dict]:
         """获取故事详情"""
         try:
-            response = await self.session.get(f"{self.base_url}/item/{story_id}.json")
+            async with self.semaphore:
+                response = await self.session.get(f"{self.base_url}/item/{story_id}.json")
             response.raise_for_status()
             return response.json()
         except Exception as e:
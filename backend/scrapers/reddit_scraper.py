@@ -14,8 +14,11 @@ logger = logging.getLogger(__name__)
 class RedditScraper:
     """Reddit 抓取器 - 从指定subreddit抓取SaaS相关内容"""
 
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
         self.session = None
+        self.transport = transport
+        # 限制并发HTTP请求数，可由SocialMediaCollector替换为共享信号量
+        self.semaphore = asyncio.Semaphore(settings.SCRAPE_CONCURRENCY)
         self.subreddits = ["SaaS", "SideProject", "MicroSaaS", "IndieHackers"]
         self.keywords = [
             "saas", "tool", "app", "platform", "service", "software",
@@ -28,6 +31,7 @@ class RedditScraper:
         try:
             self.session = httpx.AsyncClient(
                 timeout=30.0,
+                transport=self.transport,
                 headers={
                     "User-Agent": settings.REDDIT_USER_AGENT
                 }
@@ -73,7 +77,8 @@ class RedditScraper:
             url = f"https://www.reddit.com/r/{subreddit_name}/hot/"
             tools = []
 
-            response = await self.session.get(url)
+            async with self.semaphore:
+                response = await self.session.get(url)
             response.raise_for_status()
 
             soup = BeautifulSoup(response.content, 'html.parser')
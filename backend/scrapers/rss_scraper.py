@@ -1,21 +1,85 @@
-import feedparser
+import asyncio
 import httpx
 from datetime import datetime, timezone
-from typing import List, Optional
+from email.utils import parsedate_to_datetime
+from io import BytesIO
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional
 import re
 from urllib.parse import urljoin, urlparse
 import logging
 
+import lxml.html
+from lxml import etree
+
 from ..models import RawTool
 
 logger = logging.getLogger(__name__)
 
+# 匹配常见的投票数格式: "123 votes", "45 upvotes", "67 👍", "89 ♥"
+_VOTE_RE = re.compile(r'(\d+)\s*(?:votes?|upvotes?|👍|♥)', re.IGNORECASE)
+
+_ATOM_NS = "{http://www.w3.org/2005/Atom}"
+# RSS 2.0 / RSS 1.0 (RDF) / Atom 的条目标签
+_ENTRY_TAGS = ("item", "{http://purl.org/rss/1.0/}item", f"{_ATOM_NS}entry")
+
+
+def _parse_feed_date(value: str):
+    """把RFC 822(RSS)或ISO 8601(Atom)日期转为UTC的time tuple"""
+    for parse in (parsedate_to_datetime, datetime.fromisoformat):
+        try:
+            dt = parse(value)
+        except (TypeError, ValueError):
+            continue
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.utctimetuple()
+    return None
+
+
+def _iter_feed_entries(content: bytes) -> Iterator[SimpleNamespace]:
+    """流式解析RSS/Atom内容，逐条产出条目，解析后立即释放已处理的元素"""
+    # feed内容不可信：禁止解析外部实体、加载DTD和网络访问，防止XXE
+    entries = etree.iterparse(
+        BytesIO(content), events=("end",), tag=_ENTRY_TAGS,
+        resolve_entities=False, no_network=True, load_dtd=False, huge_tree=False,
+    )
+    for _, elem in entries:
+        atom = elem.tag.startswith(_ATOM_NS)
+        fields = {}
+
+        for child in elem:
+            if not isinstance(child.tag, str):
+                continue  # 注释、处理指令
+            name = etree.QName(child).localname
+
+            if name == "link" and atom:
+                # Atom链接在href属性中，优先使用alternate
+                if child.get("rel", "alternate") == "alternate" or "link" not in fields:
+                    fields["link"] = child.get("href", "")
+            elif name in ("pubDate", "published", "date"):
+                fields["published_parsed"] = _parse_feed_date("".join(child.itertext()).strip())
+            elif name == "updated":
+                fields["updated_parsed"] = _parse_feed_date("".join(child.itertext()).strip())
+            elif name in ("title", "description", "summary", "link"):
+                fields.setdefault(name, "".join(child.itertext()))
+            elif name == "content" and atom:
+                fields.setdefault("summary", "".join(child.itertext()))
+
+        yield SimpleNamespace(**fields)
+
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
 
 class RSScraper:
     """RSS feed 抓取器"""
 
-    def __init__(self, user_agent: str = "AutoSaaS-Radar-Bot/1.0"):
+    def __init__(self, user_agent: str = "AutoSaaS-Radar-Bot/1.0",
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
         self.user_agent = user_agent
+        self.transport = transport
         self.headers = {
             "User-Agent": user_agent,
             "Accept": "application/rss+xml, application/xml, text/xml"
@@ -24,21 +88,19 @@ class RSScraper:
     async def fetch_feed(self, feed_url: str, timeout: int = 30) -> Optional[List[RawTool]]:
         """抓取单个RSS feed"""
         try:
-            async with httpx.AsyncClient(timeout=timeout, headers=self.headers) as client:
+            async with httpx.AsyncClient(timeout=timeout, headers=self.headers, transport=self.transport) as client:
                 response = await client.get(feed_url)
                 response.raise_for_status()
 
-                # 解析RSS
-                feed = feedparser.parse(response.content)
-
-                if feed.bozo:
-                    logger.warning(f"RSS解析警告 {feed_url}: {feed.bozo_exception}")
-
+                # 解析RSS，格式错误时保留已解析的条目
                 tools = []
-                for entry in feed.entries:
-                    tool = self._parse_entry(entry, feed_url)
-                    if tool:
-                        tools.append(tool)
+                try:
+                    for entry in _iter_feed_entries(response.content):
+                        tool = self._parse_entry(entry, feed_url)
+                        if tool:
+                            tools.append(tool)
+                except etree.XMLSyntaxError as e:
+                    logger.warning(f"RSS解析警告 {feed_url}: {e}")
 
                 logger.info(f"从 {feed_url} 抓取到 {len(tools)} 个工具")
                 return tools
@@ -89,9 +151,9 @@ class RSScraper:
 
     def _clean_html(self, text: str) -> str:
         """清理HTML标签"""
-        import re
-        clean = re.compile('<.*?>')
-        return re.sub(clean, '', text).strip()
+        if not text:
+            return ""
+        return lxml.html.fragment_fromstring(text, create_parent="div").text_content().strip()
 
     def _extract_date(self, entry) -> datetime:
         """提取发布日期"""
@@ -115,23 +177,8 @@ class RSScraper:
         # 从描述中提取可能的投票数
         description = getattr(entry, 'description', getattr(entry, 'summary', ''))
 
-        # 匹配常见的投票数格式
-        vote_patterns = [
-            r'(\d+)\s*votes?',
-            r'(\d+)\s*upvotes?',
-            r'(\d+)\s*👍',
-            r'(\d+)\s*♥',
-        ]
-
-        for pattern in vote_patterns:
-            match = re.search(pattern, description, re.IGNORECASE)
-            if match:
-                try:
-                    return int(match.group(1))
-                except ValueError:
-                    continue
-
-        return 0
+        match = _VOTE_RE.search(description)
+        return int(match.group(1)) if match else 0
 
     def _normalize_url(self, url: str, base_url: str) -> str:
         """标准化URL"""
@@ -153,21 +200,16 @@ class RSScraper:
 async def fetch_all_feeds(feed_urls: List[str]) -> List[RawTool]:
     """抓取所有RSS feeds"""
     scraper = RSScraper()
-    all_tools = []
-
-    for feed_url in feed_urls:
-        logger.info(f"开始抓取RSS: {feed_url}")
-        tools = await scraper.fetch_feed(feed_url)
-        if tools:
-            all_tools.extend(tools)
-
-    # 去重（基于链接）
-    seen_links = set()
-    unique_tools = []
-    for tool in all_tools:
-        if tool.link not in seen_links:
-            seen_links.add(tool.link)
-            unique_tools.append(tool)
+
+    # 并发抓取所有feed
+    logger.info(f"开始抓取 {len(feed_urls)} 个RSS: {', '.join(feed_urls)}")
+    results = await asyncio.gather(*(scraper.fetch_feed(feed_url) for feed_url in feed_urls))
+
+    # 去重（基于链接，保留最先出现的）
+    unique_tools: Dict[str, RawTool] = {}
+    for tools in results:
+        for tool in tools or []:
+            unique_tools.setdefault(tool.link, tool)
 
     logger.info(f"总共抓取到 {len(unique_tools)} 个唯一工具")
-    return unique_tools
\ No newline at end of file
+    return list(unique_tools.values())
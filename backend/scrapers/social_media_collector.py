@@ -1,5 +1,6 @@
 import asyncio
 import logging
+from collections import Counter
 from typing import List, Dict, Optional
 from datetime import datetime
 
@@ -17,6 +18,10 @@ class SocialMediaCollector:
     def __init__(self):
         self.reddit_scraper = RedditScraper()
         self.hackernews_scraper = HackerNewsScraper()
+        # 所有数据源共享同一个并发上限，避免触发限流
+        self.semaphore = asyncio.Semaphore(settings.SCRAPE_CONCURRENCY)
+        self.reddit_scraper.semaphore = self.semaphore
+        self.hackernews_scraper.semaphore = self.semaphore
         self.enabled_sources = {
             "reddit": True,
             "hackernews": True
@@ -120,11 +125,7 @@ class SocialMediaCollector:
 
     def _get_source_stats(self, tools: List[RawToolData]) -> Dict[str, int]:
         """获取数据源统计"""
-        stats = {}
-        for tool in tools:
-            source = tool.source
-            stats[source] = stats.get(source, 0) + 1
-        return stats
+        return dict(Counter(tool.source for tool in tools))
 
     async def scrape_specific_source(self, source: str, limit: int = 25) -> List[RawToolData]:
         """抓取特定数据源"""
@@ -6,35 +6,80 @@ API接口测试脚本
 import asyncio
 import aiohttp
 import json
-from datetime import datetime, date, timedelta
-from typing import Dict, Any, List
+import os
+import time
+from datetime import date
+from typing import Dict, Any, List, Tuple
 
 
 class APITester:
     """API测试器"""
 
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    def __init__(self, base_url: str = "http://localhost:8000", transport: str = "aiohttp"):
+        if transport not in ("aiohttp", "httpx"):
+            raise ValueError(f"不支持的传输方式: {transport}")
         self.base_url = base_url
+        self.transport = transport
         self.session = None
+        self.client = None
+        # url -> (ETag, 响应数据)，用于条件请求
+        self._etag_cache: Dict[str, Tuple[str, Any]] = {}
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        if self.transport == "httpx":
+            import httpx
+            # HTTP/2 下并发请求复用同一连接（需要安装 h2）
+            self.client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=32)
+            )
+        else:
+            self.session = aiohttp.ClientSession()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
+        if self.client:
+            await self.client.aclose()
+
+    async def _send(self, method: str, url: str, **kwargs) -> Tuple[int, Any, Dict[str, str]]:
+        """发送请求，返回 (状态码, 响应数据, 响应头)"""
+        if self.client:
+            response = await self.client.request(method, url, **kwargs)
+            content_type = response.headers.get("content-type", "")
+            data = response.json() if "application/json" in content_type else response.text
+            return response.status_code, data, dict(response.headers)
+
+        async with self.session.request(method, url, **kwargs) as response:
+            data = await response.json() if response.content_type == "application/json" else await response.text()
+            return response.status, data, dict(response.headers)
 
     async def get(self, endpoint: str) -> Dict[str, Any]:
         """发送GET请求"""
         url = f"{self.base_url}{endpoint}"
+        cached = self._etag_cache.get(url)
+        headers = {"If-None-Match": cached[0]} if cached else None
         try:
-            async with self.session.get(url) as response:
+            status, data, response_headers = await self._send("GET", url, headers=headers)
+
+            # 内容未变化，复用缓存的响应数据
+            if status == 304 and cached:
                 return {
-                    "status": response.status,
-                    "data": await response.json() if response.content_type == "application/json" else await response.text(),
-                    "headers": dict(response.headers)
+                    "status": 200,
+                    "data": cached[1],
+                    "headers": response_headers
                 }
+
+            etag = response_headers.get("ETag") or response_headers.get("etag")
+            if status == 200 and etag:
+                self._etag_cache[url] = (etag, data)
+
+            return {
+                "status": status,
+                "data": data,
+                "headers": response_headers
+            }
         except Exception as e:
             return {
                 "status": 0,
@@ -45,12 +90,12 @@ class APITester:
         """发送POST请求"""
         url = f"{self.base_url}{endpoint}"
         try:
-            async with self.session.post(url, json=data) as response:
-                return {
-                    "status": response.status,
-                    "data": await response.json() if response.content_type == "application/json" else await response.text(),
-                    "headers": dict(response.headers)
-                }
+            status, response_data, response_headers = await self._send("POST", url, json=data)
+            return {
+                "status": status,
+                "data": response_data,
+                "headers": response_headers
+            }
         except Exception as e:
             return {
                 "status": 0,
@@ -192,7 +237,7 @@ class APITester:
         print("🚀 开始API接口测试")
         print("=" * 50)
 
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
 
         tests = [
             ("根路径", self.test_root),
@@ -211,8 +256,7 @@ class APITester:
             except Exception as e:
                 print(f"❌ {name}测试异常: {e}")
 
-        end_time = datetime.utcnow()
-        duration = (end_time - start_time).total_seconds()
+        duration = time.perf_counter() - start_time
 
         print("\n" + "=" * 50)
         print(f"🏁 测试完成")
@@ -233,7 +277,8 @@ async def main():
     print("请确保后端服务已启动 (python main.py)")
     print()
 
-    async with APITester() as tester:
+    # API_TEST_TRANSPORT=httpx 时使用HTTP/2多路复用
+    async with APITester(transport=os.getenv("API_TEST_TRANSPORT", "aiohttp")) as tester:
         await tester.run_all_tests()
 
 
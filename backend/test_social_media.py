@@ -7,6 +7,7 @@
 import asyncio
 import sys
 import os
+from collections import Counter
 
 # 添加项目根目录到路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -67,10 +68,7 @@ async def test_social_media_collector():
         print(f"✅ 统一社媒抓取测试成功! 总共获取到 {len(result)} 个工具")
 
         # 统计各数据源
-        source_stats = {}
-        for tool in result:
-            source = tool.source
-            source_stats[source] = source_stats.get(source, 0) + 1
+        source_stats = Counter(tool.source for tool in result)
 
         print("📊 数据源统计:")
         for source, count in source_stats.items():
@@ -0,0 +1,61 @@
+import asyncio
+
+import httpx
+import pytest
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """整个测试会话共享一个事件循环（可用时使用uvloop）"""
+    try:
+        import uvloop
+        loop = uvloop.new_event_loop()
+    except ImportError:
+        loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+class MockHTTPHandler:
+    """按URL分发预设响应的httpx处理器"""
+
+    def __init__(self):
+        self.routes = {}
+
+    def register(self, url: str, response):
+        """注册URL对应的响应；response为异常实例时请求会抛出该异常"""
+        self.routes[url] = response
+
+    def respond(self, url: str, status_code: int = 200, **kwargs):
+        """注册URL对应的响应，参数同httpx.Response"""
+        self.register(url, httpx.Response(status_code, **kwargs))
+
+    def clear(self):
+        self.routes.clear()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        response = self.routes.get(str(request.url))
+        if response is None:
+            return httpx.Response(404)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture(scope="session")
+def mock_http_handler():
+    return MockHTTPHandler()
+
+
+@pytest.fixture(scope="session")
+def mock_transport(mock_http_handler):
+    """整个会话共享的httpx mock传输层，注入到各抓取器中"""
+    return httpx.MockTransport(mock_http_handler)
+
+
+@pytest.fixture
+def mock_http(mock_http_handler):
+    """每个测试使用干净的路由表"""
+    mock_http_handler.clear()
+    yield mock_http_handler
+    mock_http_handler.clear()
@@ -1,28 +1,32 @@
 import pytest
 import json
+from datetime import datetime, timezone
 from unittest.mock import Mock, patch, AsyncMock
 
 from analyzers.gpt_analyzer import GPTAnalyzer
 from models import RawTool, AnalyzedTool
 
+# 测试数据统一使用固定时间，结果可复现
+NOW = datetime(2024, 1, 15, 12, tzinfo=timezone.utc)
+
 
 class TestGPTAnalyzer:
     """GPT分析器测试"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def analyzer(self):
         return GPTAnalyzer(api_key="test_key")
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_tools(self):
-        """示例工具数据"""
-        return [
+        """示例工具数据（模块内共享，使用元组防止被测试修改）"""
+        return (
             RawTool(
                 tool_name="AI Resume Builder",
                 description="Build perfect resumes with AI assistance",
                 votes=150,
                 link="https://example.com/resume-builder",
-                date=None,
+                date=NOW,
                 category=""
             ),
             RawTool(
@@ -30,10 +34,10 @@ class TestGPTAnalyzer:
                 description="Track daily productivity and habits",
                 votes=89,
                 link="https://example.com/tracker",
-                date=None,
+                date=NOW,
                 category=""
-            )
-        ]
+            ),
+        )
 
     def test_build_analysis_prompt(self, analyzer, sample_tools):
         """测试构建分析prompt"""
@@ -252,7 +256,7 @@ class TestAnalyzeToolsWithGPT:
                 description="Test description",
                 votes=10,
                 link="https://example.com",
-                date=None,
+                date=NOW,
                 category=""
             )
         ]
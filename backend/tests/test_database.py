@@ -1,20 +1,29 @@
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
-from datetime import datetime
+from datetime import datetime, timezone
 
 from database.supabase_client import SupabaseDB
 from models import Tool, AnalysisLog
 
+# 测试数据统一使用固定时间，结果可复现
+NOW = datetime(2024, 1, 15, 12, tzinfo=timezone.utc)
+
 
 class TestSupabaseDB:
     """Supabase数据库客户端测试"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def db(self):
         with patch('database.supabase_client.create_client'):
             return SupabaseDB(url="test_url", key="test_key")
 
-    @pytest.fixture
+    @pytest.fixture(autouse=True)
+    def _reset_client(self, db):
+        """db在类内共享，每个测试前清空mock客户端上配置的返回值和调用记录"""
+        db.client.reset_mock(return_value=True, side_effect=True)
+        yield
+
+    @pytest.fixture(scope="class")
     def sample_tools(self):
         """示例工具数据"""
         return [
@@ -28,16 +37,16 @@ class TestSupabaseDB:
                 trend_signal="Rising",
                 pain_point="Test pain point",
                 micro_saas_ideas=["Idea 1", "Idea 2"],
-                date=datetime.now(),
-                created_at=datetime.now()
+                date=NOW,
+                created_at=NOW
             )
         ]
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def sample_analysis_log(self):
         """示例分析日志"""
         return AnalysisLog(
-            date=datetime.now(),
+            date=NOW,
             tools_analyzed=10,
             tokens_used=1000,
             cost_usd=0.05,
@@ -239,8 +248,8 @@ class TestSupabaseDB:
             trend_signal="Rising",
             pain_point="Updated pain point",
             micro_saas_ideas=["New idea"],
-            date=datetime.now(),
-            created_at=datetime.now()
+            date=NOW,
+            created_at=NOW
         )
 
         success = await db.upsert_tool(tool)
@@ -268,8 +277,8 @@ class TestSupabaseDB:
             trend_signal="Rising",
             pain_point="New pain point",
             micro_saas_ideas=["New idea"],
-            date=datetime.now(),
-            created_at=datetime.now()
+            date=NOW,
+            created_at=NOW
         )
 
         success = await db.upsert_tool(tool)
@@ -1,10 +1,16 @@
+from types import MappingProxyType
+
+# 共享的只读空详情，避免每次抛出异常都分配新的字典
+_EMPTY_DETAILS = MappingProxyType({})
+
+
 class AutoSaaSError(Exception):
     """AutoSaaS基础异常类"""
     def __init__(self, message: str, error_code: str = None, details: dict = None):
         super().__init__(message)
         self.message = message
         self.error_code = error_code
-        self.details = details or {}
+        self.details = details if details else _EMPTY_DETAILS
 
 
 class ScrapingError(AutoSaaSError):
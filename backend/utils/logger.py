@@ -1,7 +1,8 @@
 import logging
 import sys
+from functools import lru_cache
+from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
-from datetime import datetime
 from typing import Optional
 
 from ..config import settings
@@ -20,12 +21,40 @@ class ColoredFormatter(logging.Formatter):
     }
     RESET = '\033[0m'
 
-    def format(self, record):
-        # 添加颜色
-        if record.levelname in self.COLORS:
-            record.levelname = f"{self.COLORS[record.levelname]}{record.levelname}{self.RESET}"
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 预先生成带颜色的级别名
+        self._colored_levelnames = {
+            level: f"{color}{level}{self.RESET}" for level, color in self.COLORS.items()
+        }
 
-        return super().format(record)
+    def format(self, record):
+        # 添加颜色，格式化后还原，避免其他处理器（如文件日志）看到颜色代码
+        levelname = record.levelname
+        record.levelname = self._colored_levelnames.get(levelname, levelname)
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = levelname
+
+
+@lru_cache(maxsize=1)
+def _get_file_handler() -> logging.Handler:
+    """获取共享的文件处理器，每天午夜轮转，只打开一次日志文件"""
+    # 创建日志目录
+    log_dir = Path("logs")
+    log_dir.mkdir(exist_ok=True)
+
+    file_handler = TimedRotatingFileHandler(
+        log_dir / "autosaas.log",
+        when="midnight",
+        encoding='utf-8'
+    )
+    file_handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    ))
+    return file_handler
 
 
 def setup_logger(
@@ -44,11 +73,6 @@ def setup_logger(
         return logger
 
     # 创建格式化器
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-
     colored_formatter = ColoredFormatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
@@ -60,18 +84,9 @@ def setup_logger(
         console_handler.setFormatter(colored_formatter)
         logger.addHandler(console_handler)
 
-    # 文件处理器
+    # 文件处理器（所有日志器共享同一个）
     if log_to_file:
-        # 创建日志目录
-        log_dir = Path("logs")
-        log_dir.mkdir(exist_ok=True)
-
-        # 生成日志文件名
-        log_file = log_dir / f"autosaas_{datetime.now().strftime('%Y%m%d')}.log"
-
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        logger.addHandler(_get_file_handler())
 
     return logger
 
@@ -94,11 +109,19 @@ def setup_exception_logger():
     sys.excepthook = handle_exception
 
 
-# 创建默认日志器
-app_logger = setup_logger("autosaas", level="DEBUG" if settings.debug else "INFO")
+def install() -> logging.Logger:
+    """在应用入口调用：创建默认日志器并设置异常捕获"""
+    setup_exception_logger()
+    return get_logger()
+
 
-# 设置异常捕获
-setup_exception_logger()
+def __getattr__(name: str):
+    # 默认日志器在首次访问时才创建，避免导入本模块时就创建日志目录和文件
+    if name == "app_logger":
+        app_logger = setup_logger("autosaas", level="DEBUG" if settings.debug else "INFO")
+        globals()["app_logger"] = app_logger
+        return app_logger
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class LoggerMixin:
@@ -115,4 +138,4 @@ def get_logger(name: Optional[str] = None) -> logging.Logger:
     """获取日志器"""
     if name:
         return logging.getLogger(name)
-    return app_logger
\ No newline at end of file
+    return globals().get("app_logger") or __getattr__("app_logger")
\ No newline at end of file
@@ -159,6 +159,15 @@ ALTER TABLE api_usage_stats ADD CONSTRAINT chk_endpoint_length
 ALTER TABLE api_usage_stats ADD CONSTRAINT chk_method
     CHECK (method IN ('GET', 'POST', 'PUT', 'DELETE', 'PATCH'));
 
+-- ============================================
+-- 7. 分析缓存表：analysis_cache
+-- ============================================
+CREATE TABLE IF NOT EXISTS analysis_cache (
+    hash TEXT PRIMARY KEY, -- sha256(tool_name + description)
+    response JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
 -- ============================================
 -- 表创建完成
 -- ============================================
@@ -179,9 +188,32 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- 在同一事务中写入扫描结果和分析日志，返回写入的工具数
+CREATE OR REPLACE FUNCTION save_scan_results(tools JSONB, log JSONB)
+RETURNS INT AS $$
+DECLARE
+    saved_count INT;
+BEGIN
+    INSERT INTO tools (tool_name, description, category, votes, link,
+                       trend_signal, pain_point, micro_saas_ideas, date)
+    SELECT t.tool_name, t.description, t.category, COALESCE(t.votes, 0), t.link,
+           t.trend_signal, t.pain_point, t.micro_saas_ideas, COALESCE(t.date, NOW())
+    FROM jsonb_populate_recordset(NULL::tools, tools) AS t;
+
+    GET DIAGNOSTICS saved_count = ROW_COUNT;
+
+    INSERT INTO analysis_logs (date, tools_analyzed, status)
+    SELECT COALESCE(l.date, NOW()), l.tools_analyzed, l.status
+    FROM jsonb_populate_record(NULL::analysis_logs, log) AS l;
+
+    RETURN saved_count;
+END;
+$$ LANGUAGE plpgsql;
+
 COMMENT ON TABLE tools IS 'AI工具数据主表，存储从各个数据源抓取并分析后的工具信息';
 COMMENT ON TABLE categories IS '工具分类表，定义工具的分类和元数据';
 COMMENT ON TABLE data_sources IS '数据源配置表，管理各个数据抓取源';
 COMMENT ON TABLE analysis_logs IS '分析日志表，记录GPT分析的执行情况和统计信息';
 COMMENT ON TABLE system_settings IS '系统配置表，存储可动态调整的系统参数';
-COMMENT ON TABLE api_usage_stats IS 'API使用统计表，用于监控和分析API使用情况';
\ No newline at end of file
+COMMENT ON TABLE api_usage_stats IS 'API使用统计表，用于监控和分析API使用情况';
+COMMENT ON TABLE analysis_cache IS 'GPT分析缓存表，按工具名称和描述的哈希复用分析结果';
\ No newline at end of file
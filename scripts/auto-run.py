@@ -10,6 +10,8 @@ AutoSaaS Radar - 自动化调度脚本
 4. 错误处理和重试
 """
 
+import asyncio
+import functools
 import os
 import sys
 import json
@@ -19,22 +21,57 @@ import time
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # 可选依赖，未安装时退回标准库json
+    orjson = None
+
 # 添加项目根目录到路径
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
+
+class JsonFormatter(logging.Formatter):
+    """结构化JSON日志格式化器，每条日志输出一行JSON"""
+
+    def format(self, record):
+        entry = {
+            "ts": record.created,
+            "lvl": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        if orjson:
+            return orjson.dumps(entry).decode()
+        return json.dumps(entry, ensure_ascii=False)
+
+
 # 配置日志
+_json_formatter = JsonFormatter()
+_file_handler = logging.FileHandler('logs/auto-run.log', encoding='utf-8')
+_file_handler.setFormatter(_json_formatter)
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(_json_formatter)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/auto-run.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[_file_handler, _stream_handler]
 )
 
 logger = logging.getLogger(__name__)
 
+# 数据库分块插入的块大小
+INSERT_BATCH_SIZE = 100
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_file(path, mtime):
+    """解析配置文件，按 (路径, 修改时间) 缓存，文件未变化时不再重复解析"""
+    data = Path(path).read_bytes()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
 class AutoScheduler:
     def __init__(self):
         self.config_file = project_root / "config" / "deploy-config.json"
@@ -43,11 +80,10 @@ class AutoScheduler:
     def load_config(self):
         """加载配置文件"""
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
+            self.config = _load_config_file(str(self.config_file), self.config_file.stat().st_mtime)
             logger.info("配置文件加载成功")
         except Exception as e:
-            logger.error(f"配置文件加载失败: {e}")
+            logger.error("配置文件加载失败: %s", e)
             self.config = self.get_default_config()
 
     def get_default_config(self):
@@ -60,7 +96,7 @@ class AutoScheduler:
             }
         }
 
-    def run_data_scraper(self):
+    async def run_data_scraper(self):
         """运行数据抓取"""
         logger.info("🔍 开始数据抓取...")
         try:
@@ -68,20 +104,31 @@ class AutoScheduler:
             from backend.scrapers.rss_scraper import RSScraper
             from backend.scrapers.social_scraper import SocialScraper
 
-            # RSS抓取
+            # RSS和社媒抓取并发执行
             rss_scraper = RSScraper()
-            rss_data = rss_scraper.scrape_all()
-            logger.info(f"RSS抓取完成，获得 {len(rss_data)} 条数据")
-
-            # 社媒抓取
             social_scraper = SocialScraper()
-            social_data = social_scraper.scrape_all()
-            logger.info(f"社媒抓取完成，获得 {len(social_data)} 条数据")
+            rss_data, social_data = await asyncio.gather(
+                rss_scraper.scrape_all(),
+                social_scraper.scrape_all(),
+                return_exceptions=True
+            )
+
+            if isinstance(rss_data, Exception):
+                logger.error("RSS抓取失败: %s", rss_data)
+                rss_data = []
+            else:
+                logger.info("RSS抓取完成，获得 %s 条数据", len(rss_data))
+
+            if isinstance(social_data, Exception):
+                logger.error("社媒抓取失败: %s", social_data)
+                social_data = []
+            else:
+                logger.info("社媒抓取完成，获得 %s 条数据", len(social_data))
 
             return rss_data + social_data
 
         except Exception as e:
-            logger.error(f"数据抓取失败: {e}")
+            logger.error("数据抓取失败: %s", e)
             return []
 
     def run_ai_analysis(self, raw_data):
@@ -92,38 +139,44 @@ class AutoScheduler:
 
             analyzer = GPTAnalyzer()
             analyzed_data = analyzer.analyze_tools(raw_data)
-            logger.info(f"AI分析完成，处理 {len(analyzed_data)} 个工具")
+            logger.info("AI分析完成，处理 %s 个工具", len(analyzed_data))
 
             return analyzed_data
 
         except Exception as e:
-            logger.error(f"AI分析失败: {e}")
+            logger.error("AI分析失败: %s", e)
             return []
 
-    def run_database_update(self, analyzed_data):
+    async def run_database_update(self, analyzed_data):
         """运行数据库更新"""
         logger.info("💾 开始数据库更新...")
         try:
-            from backend.database.supabase_client import SupabaseClient
+            from backend.database.supabase_client import SupabaseDB
 
-            db_client = SupabaseClient()
-            inserted_count = db_client.batch_insert_tools(analyzed_data)
-            logger.info(f"数据库更新完成，插入 {inserted_count} 条记录")
+            db_client = SupabaseDB()
+
+            # 分块插入；insert_tools内部使用同步的supabase客户端，并发执行并不会重叠，因此逐块顺序插入
+            inserted_count = 0
+            for i in range(0, len(analyzed_data), INSERT_BATCH_SIZE):
+                chunk = analyzed_data[i:i + INSERT_BATCH_SIZE]
+                if await db_client.insert_tools(chunk):
+                    inserted_count += len(chunk)
+            logger.info("数据库更新完成，插入 %s 条记录", inserted_count)
 
             return inserted_count
 
         except Exception as e:
-            logger.error(f"数据库更新失败: {e}")
+            logger.error("数据库更新失败: %s", e)
             return 0
 
-    def run_full_pipeline(self):
+    async def run_full_pipeline(self):
         """运行完整的自动化流程"""
         logger.info("🚀 开始完整的自动化流程...")
         start_time = datetime.now()
 
         try:
             # 1. 数据抓取
-            raw_data = self.run_data_scraper()
+            raw_data = await self.run_data_scraper()
             if not raw_data:
                 logger.warning("没有抓取到数据，流程终止")
                 return
@@ -135,7 +188,7 @@ class AutoScheduler:
                 return
 
             # 3. 数据库更新
-            inserted_count = self.run_database_update(analyzed_data)
+            inserted_count = await self.run_database_update(analyzed_data)
 
             # 4. 发送通知
             self.send_completion_notification(inserted_count)
@@ -143,27 +196,31 @@ class AutoScheduler:
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
 
-            logger.info(f"✅ 自动化流程完成！耗时: {duration:.2f}秒，新增记录: {inserted_count}")
+            logger.info("✅ 自动化流程完成！耗时: %.2f秒，新增记录: %s", duration, inserted_count)
 
         except Exception as e:
-            logger.error(f"自动化流程失败: {e}")
+            logger.error("自动化流程失败: %s", e)
             self.send_error_notification(str(e))
 
+    def run_pipeline_job(self):
+        """供schedule调用的同步入口"""
+        asyncio.run(self.run_full_pipeline())
+
     def send_completion_notification(self, count):
         """发送完成通知"""
         try:
             # 这里可以添加邮件或Telegram通知
-            logger.info(f"📢 自动化任务完成，新增 {count} 个AI工具分析")
+            logger.info("📢 自动化任务完成，新增 %s 个AI工具分析", count)
         except Exception as e:
-            logger.error(f"通知发送失败: {e}")
+            logger.error("通知发送失败: %s", e)
 
     def send_error_notification(self, error_msg):
         """发送错误通知"""
         try:
             # 这里可以添加错误通知
-            logger.error(f"🚨 自动化任务失败: {error_msg}")
+            logger.error("🚨 自动化任务失败: %s", error_msg)
         except Exception as e:
-            logger.error(f"错误通知发送失败: {e}")
+            logger.error("错误通知发送失败: %s", e)
 
     def setup_scheduler(self):
         """设置定时调度"""
@@ -171,22 +228,31 @@ class AutoScheduler:
 
         # 简单的定时实现
         if schedule_str == "0 9 * * *":  # 每天上午9点
-            schedule.every().day.at("09:00").do(self.run_full_pipeline)
+            schedule.every().day.at("09:00").do(self.run_pipeline_job)
         elif schedule_str == "*/30 * * * *":  # 每30分钟（测试用）
-            schedule.every(30).minutes.do(self.run_full_pipeline)
+            schedule.every(30).minutes.do(self.run_pipeline_job)
         else:
             # 默认每小时运行一次
-            schedule.every().hour.do(self.run_full_pipeline)
+            schedule.every().hour.do(self.run_pipeline_job)
 
-        logger.info(f"定时调度已设置: {schedule_str}")
+        logger.info("定时调度已设置: %s", schedule_str)
 
     def run_scheduler(self):
         """运行调度器"""
         logger.info("🕐 调度器启动，等待执行时间...")
 
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # 每分钟检查一次
+        try:
+            while True:
+                # 直接休眠到下一个任务的执行时间
+                idle = schedule.idle_seconds()
+                if idle is None:
+                    logger.warning("没有待执行的调度任务，调度器退出")
+                    break
+                if idle > 0:
+                    time.sleep(idle)
+                schedule.run_pending()
+        except KeyboardInterrupt:
+            logger.info("调度器已停止")
 
 def main():
     """主函数"""
@@ -198,7 +264,7 @@ def main():
 
     if len(sys.argv) > 1 and sys.argv[1] == "--run-now":
         # 立即执行一次
-        scheduler.run_full_pipeline()
+        scheduler.run_pipeline_job()
     else:
         # 设置定时调度
         scheduler.setup_scheduler()
@@ -6,10 +6,13 @@
 
 import asyncio
 import argparse
+import hashlib
 import json
 import logging
 import sys
+from collections import Counter
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 
 # 添加项目根目录到路径
@@ -21,6 +24,17 @@ from app.services.data_collector import DataCollector
 from app.services.gpt_analyzer import GPTAnalyzer
 from app.database.connection import DatabaseManager
 from app.models.analysis import AnalysisLog
+from app.models.tool import AnalyzedTool
+
+try:
+    import orjson
+except ImportError:  # 可选依赖，未安装时退回标准库json
+    orjson = None
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # 可选依赖，未安装时退回数据库检查
+    aioredis = None
 
 # 配置日志
 logging.basicConfig(
@@ -35,6 +49,12 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _analysis_hash(tool) -> str:
+    """根据工具名称和描述计算分析缓存键"""
+    text = f"{tool.tool_name}\n{tool.description or ''}"
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
 class DailyScanner:
     """每日扫描器"""
 
@@ -42,19 +62,34 @@ class DailyScanner:
         self.db_manager = DatabaseManager()
         self.data_collector = DataCollector()
         self.gpt_analyzer = GPTAnalyzer()
+        self.redis = (
+            aioredis.from_url(settings.REDIS_URL)
+            if aioredis and settings.REDIS_URL else None
+        )
 
     async def run_scan(self, dry_run: bool = False, force: bool = False) -> bool:
         """运行每日扫描"""
         start_time = datetime.now()
         logger.info(f"开始每日扫描任务 - {start_time}")
 
+        scan_key = f"scan:{start_time.date()}"
+        claimed = None
+        succeeded = False
+
         try:
+            # 检查是否需要运行（避免重复），优先通过Redis标记判断，无需连接数据库
+            if not force and not dry_run:
+                claimed = await self._claim_scan(scan_key)
+                if claimed is False:
+                    logger.info("今日已执行扫描，跳过")
+                    return True
+
             # 初始化数据库连接
             await self.db_manager.initialize()
             logger.info("数据库连接成功")
 
-            # 检查是否需要运行（避免重复）
-            if not force and not dry_run:
+            # Redis不可用时退回数据库检查
+            if not force and not dry_run and claimed is None:
                 if await self._already_scanned_today():
                     logger.info("今日已执行扫描，跳过")
                     return True
@@ -77,19 +112,11 @@ class DailyScanner:
 
             logger.info(f"分析了 {len(analyzed_tools)} 个工具")
 
-            # 3. 保存数据
+            # 3. 保存数据并记录分析日志（同一事务内完成）
             if not dry_run:
                 logger.info("开始保存数据...")
-                saved_count = await self._save_data(analyzed_tools)
+                saved_count = await self._save_data(analyzed_tools, tools_collected=len(raw_tools))
                 logger.info(f"保存了 {saved_count} 个工具到数据库")
-
-                # 4. 记录分析日志
-                await self._log_analysis(
-                    tools_collected=len(raw_tools),
-                    tools_analyzed=len(analyzed_tools),
-                    tools_saved=saved_count,
-                    status="success"
-                )
             else:
                 logger.info("[DRY RUN] 跳过数据保存")
 
@@ -100,6 +127,7 @@ class DailyScanner:
             duration = end_time - start_time
             logger.info(f"扫描任务完成 - 耗时: {duration}")
 
+            succeeded = True
             return True
 
         except Exception as e:
@@ -118,8 +146,16 @@ class DailyScanner:
             return False
 
         finally:
-            # 清理资源
-            await self.db_manager.close()
+            # 成功则标记完成，其余任何退出路径都释放今日标记，允许当天重试
+            if claimed:
+                await self._mark_scan(scan_key, "success" if succeeded else None)
+
+    async def shutdown(self):
+        """释放扫描器持有的数据库和Redis连接"""
+        # 连接保留给同一事件循环中的后续扫描复用，由shutdown统一关闭
+        if self.redis:
+            await self.redis.close()
+        await self.db_manager.close()
 
     async def _collect_data(self):
         """收集数据"""
@@ -133,25 +169,64 @@ class DailyScanner:
     async def _analyze_data(self, raw_tools):
         """分析数据"""
         try:
+            cached = {}
+            hashes = [None] * len(raw_tools)
+            if settings.ENABLE_ANALYSIS_CACHE:
+                # 描述未变化的工具直接复用历史分析结果，缓存键按输入逐条计算
+                hashes = [_analysis_hash(tool) for tool in raw_tools]
+                cached = await self.db_manager.get_cached_analyses(
+                    list(set(hashes)), settings.ANALYSIS_CACHE_TTL_DAYS
+                )
+                hits = sum(key in cached for key in hashes)
+                logger.info(f"分析缓存命中: {hits}/{len(raw_tools)}")
+
+            # 结果按输入位置排列，每个命中缓存的输入各对应一条结果
+            results = [AnalyzedTool(**cached[key]) if key in cached else None for key in hashes]
+            pending_indices = [i for i, result in enumerate(results) if result is None]
+            if not pending_indices:
+                return results
+
+            pending = [raw_tools[i] for i in pending_indices]
+
             # 估算成本
-            cost_info = await self.gpt_analyzer.get_analysis_cost(len(raw_tools))
+            cost_info = await self.gpt_analyzer.get_analysis_cost(len(pending))
             logger.info(f"预估分析成本: ${cost_info['estimated_cost_usd']:.4f}")
 
-            # 执行分析
-            return await self.gpt_analyzer.analyze_tools(raw_tools)
+            # 执行分析，input_indices给出每条结果对应pending中的位置
+            result = await self.gpt_analyzer.analyze_tools(pending)
+            unmatched = []
+            fresh = {}
+            for tool, index in zip(result.analyzed_tools, result.input_indices):
+                if index is None:
+                    unmatched.append(tool)
+                    continue
+                position = pending_indices[index]
+                results[position] = tool
+                if hashes[position] is not None:
+                    fresh[hashes[position]] = tool.dict()
+
+            if settings.ENABLE_ANALYSIS_CACHE and fresh:
+                await self.db_manager.save_cached_analyses(fresh)
+
+            analyzed_tools = [tool for tool in results if tool is not None]
+            analyzed_tools.extend(unmatched)
+            return analyzed_tools
         except Exception as e:
             logger.error(f"数据分析失败: {e}")
             raise
 
-    async def _save_data(self, analyzed_tools):
-        """保存数据到数据库"""
+    async def _save_data(self, analyzed_tools, tools_collected: int):
+        """保存数据到数据库，并在同一事务中写入成功的分析日志"""
         try:
-            saved_count = 0
-            for tool in analyzed_tools:
-                success = await self.db_manager.save_tool(tool)
-                if success:
-                    saved_count += 1
-            return saved_count
+            # 工具和日志通过一次RPC批量写入，避免多次数据库往返
+            rows = [tool.dict() for tool in analyzed_tools]
+            log_data = {
+                "date": datetime.now().isoformat(),
+                "tools_collected": tools_collected,
+                "tools_analyzed": len(analyzed_tools),
+                "status": "success"
+            }
+            return await self.db_manager.save_scan_results(rows, log_data)
         except Exception as e:
             logger.error(f"数据保存失败: {e}")
             raise
@@ -172,6 +247,27 @@ class DailyScanner:
         except Exception as e:
             logger.error(f"记录分析日志失败: {e}")
 
+    async def _claim_scan(self, key: str):
+        """通过Redis抢占今日扫描标记，Redis不可用时返回None"""
+        if not self.redis:
+            return None
+
+        try:
+            return bool(await self.redis.set(key, "running", nx=True, ex=90000))
+        except Exception as e:
+            logger.warning(f"Redis扫描标记检查失败: {e}")
+            return None
+
+    async def _mark_scan(self, key: str, status):
+        """更新今日扫描标记，status为None时删除标记"""
+        try:
+            if status is None:
+                await self.redis.delete(key)
+            else:
+                await self.redis.set(key, status, ex=90000)
+        except Exception as e:
+            logger.warning(f"Redis扫描标记更新失败: {e}")
+
     async def _already_scanned_today(self) -> bool:
         """检查今日是否已扫描"""
         try:
@@ -187,28 +283,21 @@ class DailyScanner:
 
     async def _generate_report(self, raw_tools, analyzed_tools, dry_run: bool):
         """生成扫描报告"""
+        now = datetime.now()
         try:
-            # 统计数据
-            categories = {}
-            trends = {}
-            sources = {}
-
+            # 统计数据：分类和趋势在同一次遍历中完成
+            category_counter = Counter()
+            trend_counter = Counter()
             for tool in analyzed_tools:
-                # 统计分类
-                category = tool.category.value
-                categories[category] = categories.get(category, 0) + 1
-
-                # 统计趋势
-                trend = tool.trend_signal.value
-                trends[trend] = trends.get(trend, 0) + 1
+                category_counter[tool.category.value] += 1
+                trend_counter[tool.trend_signal.value] += 1
 
-            for tool in raw_tools:
-                # 统计数据源
-                source = tool.source
-                sources[source] = sources.get(source, 0) + 1
+            categories = dict(category_counter)
+            trends = dict(trend_counter)
+            sources = dict(Counter(tool.source for tool in raw_tools))
 
             report = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
                 "dry_run": dry_run,
                 "summary": {
                     "tools_collected": len(raw_tools),
@@ -225,7 +314,7 @@ class DailyScanner:
                         "pain_point": tool.pain_point,
                         "ideas": tool.micro_saas_ideas
                     }
-                    for tool in analyzed_tools[:5]  # Top 5
+                    for tool in islice(analyzed_tools, 5)  # Top 5
                 ]
             }
 
@@ -233,9 +322,12 @@ class DailyScanner:
             reports_dir = project_root / "reports"
             reports_dir.mkdir(exist_ok=True)
 
-            report_file = reports_dir / f"scan_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(report_file, 'w', encoding='utf-8') as f:
-                json.dump(report, f, ensure_ascii=False, indent=2)
+            report_file = reports_dir / f"scan_report_{now:%Y%m%d_%H%M%S}.json"
+            if orjson:
+                report_file.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2, default=str))
+            else:
+                with open(report_file, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, ensure_ascii=False, indent=2, default=str)
 
             logger.info(f"扫描报告已保存: {report_file}")
 
@@ -265,7 +357,10 @@ async def main():
 
     # 运行扫描
     scanner = DailyScanner()
-    success = await scanner.run_scan(dry_run=args.dry_run, force=args.force)
+    try:
+        success = await scanner.run_scan(dry_run=args.dry_run, force=args.force)
+    finally:
+        await scanner.shutdown()
 
     # 退出码
     sys.exit(0 if success else 1)
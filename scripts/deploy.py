@@ -5,19 +5,42 @@
 """
 
 import argparse
+import asyncio
+import functools
+import hashlib
 import json
 import logging
 import os
+import shutil
 import subprocess
 import sys
 import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+import httpx
+
+try:
+    import orjson
+except ImportError:  # 可选依赖，未安装时退回标准库json
+    orjson = None
+
+try:
+    import asyncpg
+except ImportError:  # 可选依赖，未安装时退回psql逐个执行迁移
+    asyncpg = None
+
+# 迁移期间持有的PostgreSQL咨询锁ID，防止多个节点同时迁移
+MIGRATION_LOCK_ID = 727001
+
 # 项目根目录
 project_root = Path(__file__).parent.parent
 
+# 部署状态（已部署提交、依赖清单哈希）的存放目录，已加入.gitignore
+DEPLOY_STATE_DIR = project_root / ".deploy_state"
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -31,6 +54,13 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=4)
+def _load_config_file(path, mtime):
+    """解析部署配置文件，按 (路径, 修改时间) 缓存，多个环境共用一次解析结果"""
+    data = Path(path).read_bytes()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
 class Deployer:
     """部署管理器"""
 
@@ -38,6 +68,13 @@ class Deployer:
         self.environment = environment
         self.deploy_config = self._load_deploy_config()
         self.deploy_log = []
+        self._http_client = httpx.AsyncClient(timeout=2)
+        # 前后端位于同一仓库，并行部署时git操作需要串行
+        self._git_lock = asyncio.Lock()
+
+    async def close(self):
+        """释放健康检查使用的HTTP连接池"""
+        await self._http_client.aclose()
 
     def _load_deploy_config(self) -> Dict:
         """加载部署配置"""
@@ -47,12 +84,10 @@ class Deployer:
             logger.error(f"部署配置文件不存在: {config_file}")
             sys.exit(1)
 
-        with open(config_file, 'r') as f:
-            config = json.load(f)
-
+        config = _load_config_file(str(config_file), config_file.stat().st_mtime)
         return config.get(self.environment, {})
 
-    def deploy_backend(self) -> bool:
+    async def deploy_backend(self) -> bool:
         """部署后端服务"""
         logger.info("开始部署后端服务...")
 
@@ -60,52 +95,73 @@ class Deployer:
             backend_dir = project_root / "backend"
 
             # 1. 检查代码
-            if not self._run_command(["git", "pull", "origin", "main"], backend_dir):
-                return False
+            async with self._git_lock:
+                if not await self._run_command(["git", "pull", "origin", "main"], backend_dir):
+                    return False
+                revision = await self._git_head(backend_dir)
 
-            # 2. 安装依赖
-            if not self._run_command(["pip", "install", "-r", "requirements.txt"], backend_dir):
+            if await self._already_deployed("backend", revision, self._health_check_backend):
+                return True
+
+            # 2. 安装依赖（存在锁定文件时跳过依赖解析，直接按哈希安装）
+            lockfile = backend_dir / "requirements.lock"
+            if lockfile.exists():
+                pip_cmd = [
+                    "pip", "install", "--no-deps", "--require-hashes",
+                    "--prefer-binary", "-r", lockfile.name
+                ]
+            else:
+                lockfile = backend_dir / "requirements.txt"
+                pip_cmd = ["pip", "install", "-r", lockfile.name]
+
+            pip_cache_dir = self.deploy_config.get("pip_cache_dir")
+            if pip_cache_dir:
+                pip_cmd.append(f"--cache-dir={pip_cache_dir}")
+
+            if not await self._install_if_changed("pip", pip_cmd, backend_dir, lockfile):
                 return False
 
             # 3. 运行测试
             if self.deploy_config.get("run_tests", True):
-                if not self._run_command(["python", "-m", "pytest", "tests/"], backend_dir):
+                if not await self._run_command(["python", "-m", "pytest", "tests/"], backend_dir):
                     logger.warning("后端测试失败，但继续部署")
 
             # 4. 构建Docker镜像（如果使用Docker）
             if self.deploy_config.get("use_docker", False):
                 docker_tag = f"autosaas-backend:{int(time.time())}"
-                if not self._run_command([
-                    "docker", "build", "-t", docker_tag, "."
-                ], backend_dir):
-                    return False
-
-                # 推送到镜像仓库
                 registry = self.deploy_config.get("docker_registry")
+
                 if registry:
-                    if not self._run_command([
-                        "docker", "tag", docker_tag, f"{registry}/{docker_tag}"
+                    # 通过镜像仓库共享BuildKit层缓存，构建完成后直接推送
+                    cache_ref = f"{registry}/autosaas-backend:cache"
+                    if not await self._run_command([
+                        "docker", "buildx", "build",
+                        f"--cache-from=type=registry,ref={cache_ref}",
+                        f"--cache-to=type=registry,ref={cache_ref},mode=max",
+                        "-t", f"{registry}/{docker_tag}",
+                        "--push", "."
                     ], backend_dir):
                         return False
-
-                    if not self._run_command([
-                        "docker", "push", f"{registry}/{docker_tag}"
+                else:
+                    if not await self._run_command([
+                        "docker", "build", "-t", docker_tag, "."
                     ], backend_dir):
                         return False
 
             # 5. 重启服务
             if self.deploy_config.get("use_systemd", False):
-                if not self._restart_systemd_service("autosaas-backend"):
+                if not await self._restart_systemd_service("autosaas-backend"):
                     return False
             else:
                 # 使用进程管理器重启
-                if not self._restart_process_manager("backend"):
+                if not await self._restart_process_manager("backend"):
                     return False
 
             # 6. 健康检查
-            if not self._health_check_backend():
+            if not await self._health_check_backend():
                 return False
 
+            self._save_deployed_revision("backend", revision)
             self._log_deploy_step("backend", "success", "后端服务部署成功")
             return True
 
@@ -114,7 +170,7 @@ class Deployer:
             self._log_deploy_step("backend", "failed", str(e))
             return False
 
-    def deploy_frontend(self) -> bool:
+    async def deploy_frontend(self) -> bool:
         """部署前端应用"""
         logger.info("开始部署前端应用...")
 
@@ -122,11 +178,19 @@ class Deployer:
             frontend_dir = project_root / "frontend"
 
             # 1. 检查代码
-            if not self._run_command(["git", "pull", "origin", "main"], frontend_dir):
-                return False
+            async with self._git_lock:
+                if not await self._run_command(["git", "pull", "origin", "main"], frontend_dir):
+                    return False
+                revision = await self._git_head(frontend_dir)
+
+            if await self._already_deployed("frontend", revision, self._health_check_frontend):
+                return True
 
             # 2. 安装依赖
-            if not self._run_command(["npm", "install"], frontend_dir):
+            lockfile = frontend_dir / "package-lock.json"
+            if not lockfile.exists():
+                lockfile = frontend_dir / "package.json"
+            if not await self._install_if_changed("npm", ["npm", "install"], frontend_dir, lockfile):
                 return False
 
             # 3. 构建应用
@@ -136,7 +200,7 @@ class Deployer:
                 env_cmd.extend([f"{key}={value}"])
 
             build_cmd = env_cmd + ["npm", "run", "build"]
-            if not self._run_command(build_cmd, frontend_dir):
+            if not await self._run_command(build_cmd, frontend_dir):
                 return False
 
             # 4. 部署到Vercel
@@ -145,13 +209,14 @@ class Deployer:
                 if self.environment == "staging":
                     vercel_cmd = ["vercel"]
 
-                if not self._run_command(vercel_cmd, frontend_dir):
+                if not await self._run_command(vercel_cmd, frontend_dir):
                     return False
 
             # 5. 健康检查
-            if not self._health_check_frontend():
+            if not await self._health_check_frontend():
                 return False
 
+            self._save_deployed_revision("frontend", revision)
             self._log_deploy_step("frontend", "success", "前端应用部署成功")
             return True
 
@@ -160,7 +225,7 @@ class Deployer:
             self._log_deploy_step("frontend", "failed", str(e))
             return False
 
-    def deploy_database(self) -> bool:
+    async def deploy_database(self) -> bool:
         """部署数据库迁移"""
         logger.info("开始部署数据库迁移...")
 
@@ -168,18 +233,28 @@ class Deployer:
             database_dir = project_root / "database"
 
             # 1. 备份数据库
-            if not self._backup_database():
+            if not await self._backup_database():
                 return False
 
             # 2. 运行迁移
-            migration_files = sorted(database_dir.glob("*.sql"))
-            for migration_file in migration_files:
-                logger.info(f"运行迁移: {migration_file.name}")
-                if not self._run_sql_file(migration_file):
+            with os.scandir(database_dir) as entries:
+                migration_files = sorted(
+                    (Path(entry.path) for entry in entries
+                     if entry.name.endswith(".sql") and entry.is_file()),
+                    key=lambda path: path.name
+                )
+            db_type = self.deploy_config.get("database", {}).get("type", "postgresql")
+            if db_type == "postgresql" and asyncpg is not None:
+                if not await self._run_migrations(migration_files):
                     return False
+            else:
+                for migration_file in migration_files:
+                    logger.info(f"运行迁移: {migration_file.name}")
+                    if not await self._run_sql_file(migration_file):
+                        return False
 
             # 3. 验证数据库
-            if not self._verify_database():
+            if not await self._verify_database():
                 return False
 
             self._log_deploy_step("database", "success", "数据库迁移成功")
@@ -190,48 +265,83 @@ class Deployer:
             self._log_deploy_step("database", "failed", str(e))
             return False
 
-    def deploy_all(self) -> bool:
+    async def deploy_all(self) -> bool:
         """部署所有服务"""
         logger.info("开始完整部署...")
 
-        # 按顺序部署：数据库 -> 后端 -> 前端
+        # 先部署数据库，成功后并行部署互不依赖的后端和前端
         services = ["database", "backend", "frontend"]
         success_count = 0
 
-        for service in services:
-            if getattr(self, f"deploy_{service}")():
-                success_count += 1
-                logger.info(f"{service} 部署成功")
-            else:
-                logger.error(f"{service} 部署失败")
-                if service == "database":
-                    # 数据库部署失败时停止整个部署
-                    logger.error("数据库部署失败，停止后续部署")
-                    break
+        if await self.deploy_database():
+            success_count += 1
+            logger.info("database 部署成功")
+
+            results = await asyncio.gather(
+                *(getattr(self, f"deploy_{service}")() for service in services[1:])
+            )
+
+            for service, result in zip(services[1:], results):
+                if result:
+                    success_count += 1
+                    logger.info(f"{service} 部署成功")
+                else:
+                    logger.error(f"{service} 部署失败")
+        else:
+            logger.error("database 部署失败")
+            # 数据库部署失败时停止整个部署
+            logger.error("数据库部署失败，停止后续部署")
 
         # 生成部署报告
         self._generate_deploy_report(success_count, len(services))
 
         return success_count == len(services)
 
-    def _run_command(self, cmd: List[str], cwd: Path, timeout: int = 300) -> bool:
+    async def _run_command(self, cmd: List[str], cwd: Path, timeout: int = 300) -> bool:
         """运行命令"""
+        process = None
         try:
             logger.info(f"执行命令: {' '.join(cmd)}")
 
-            result = subprocess.run(
-                cmd,
-                cwd=cwd,
-                timeout=timeout,
-                capture_output=True,
-                text=True
+            # 逐行输出子进程日志，只保留末尾若干行用于错误提示
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=str(cwd),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT
             )
-
-            if result.returncode == 0:
+            tail = deque(maxlen=20)
+
+            def emit(raw_line: bytes):
+                line = raw_line.decode(errors="replace").rstrip()
+                tail.append(line)
+                logger.info(line)
+
+            async def stream_output():
+                # 按固定大小分块读取再自行切行，超长的进度输出行不会触发StreamReader的行长度限制
+                pending = b""
+                while True:
+                    chunk = await process.stdout.read(65536)
+                    if not chunk:
+                        break
+                    *lines, pending = (pending + chunk).split(b"\n")
+                    for raw_line in lines:
+                        emit(raw_line)
+                if pending:
+                    emit(pending)
+                return await process.wait()
+
+            try:
+                returncode = await asyncio.wait_for(stream_output(), timeout)
+            except asyncio.TimeoutError:
+                raise subprocess.TimeoutExpired(cmd, timeout)
+
+            if returncode == 0:
                 logger.info(f"命令执行成功")
                 return True
             else:
-                logger.error(f"命令执行失败: {result.stderr}")
+                output = "\n".join(tail)
+                logger.error(f"命令执行失败: {output}")
                 return False
 
         except subprocess.TimeoutExpired:
@@ -240,16 +350,77 @@ class Deployer:
         except Exception as e:
             logger.error(f"命令执行异常: {e}")
             return False
+        finally:
+            # 超时、异常或被取消时结束并回收子进程
+            if process is not None and process.returncode is None:
+                process.kill()
+                await process.wait()
+
+    async def _git_head(self, cwd: Path) -> Optional[str]:
+        """获取当前提交的SHA，失败时返回None"""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "git", "rev-parse", "HEAD",
+                cwd=str(cwd),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            stdout, _ = await process.communicate()
+            return stdout.decode().strip() if process.returncode == 0 else None
+        except Exception as e:
+            logger.warning(f"获取当前提交失败: {e}")
+            return None
+
+    async def _already_deployed(self, component: str, revision: Optional[str], health_check) -> bool:
+        """当前提交已成功部署且服务健康时跳过本次部署"""
+        state_file = DEPLOY_STATE_DIR / f"{component}.sha"
+        if not revision or not state_file.exists() or state_file.read_text().strip() != revision:
+            return False
+
+        if not await health_check():
+            return False
+
+        logger.info(f"{component} 提交 {revision[:8]} 已部署，跳过")
+        self._log_deploy_step(component, "success", f"提交 {revision[:8]} 未变化，跳过部署")
+        return True
 
-    def _restart_systemd_service(self, service_name: str) -> bool:
+    def _save_deployed_revision(self, component: str, revision: Optional[str]):
+        """记录最近一次成功部署的提交"""
+        if revision:
+            state_file = DEPLOY_STATE_DIR / f"{component}.sha"
+            state_file.parent.mkdir(exist_ok=True)
+            state_file.write_text(revision)
+
+    async def _install_if_changed(self, name: str, cmd: List[str], cwd: Path, lockfile: Path) -> bool:
+        """依赖清单哈希与上次成功安装时一致则跳过安装"""
+        state_file = DEPLOY_STATE_DIR / f"{name}.sha256"
+
+        try:
+            digest = hashlib.sha256(lockfile.read_bytes()).hexdigest()
+        except OSError:
+            digest = None
+
+        if digest and state_file.exists() and state_file.read_text().strip() == digest:
+            logger.info(f"{lockfile.name} 未变化，跳过 {name} 依赖安装")
+            return True
+
+        if not await self._run_command(cmd, cwd):
+            return False
+
+        if digest:
+            state_file.parent.mkdir(exist_ok=True)
+            state_file.write_text(digest)
+        return True
+
+    async def _restart_systemd_service(self, service_name: str) -> bool:
         """重启systemd服务"""
         try:
             # 重启服务
-            if not self._run_command(["sudo", "systemctl", "restart", service_name], Path.cwd()):
+            if not await self._run_command(["sudo", "systemctl", "restart", service_name], Path.cwd()):
                 return False
 
             # 检查状态
-            if not self._run_command(["sudo", "systemctl", "is-active", service_name], Path.cwd()):
+            if not await self._run_command(["sudo", "systemctl", "is-active", service_name], Path.cwd()):
                 return False
 
             logger.info(f"SystemD服务 {service_name} 重启成功")
@@ -259,14 +430,14 @@ class Deployer:
             logger.error(f"重启SystemD服务失败: {e}")
             return False
 
-    def _restart_process_manager(self, service: str) -> bool:
+    async def _restart_process_manager(self, service: str) -> bool:
         """重启进程管理器中的服务"""
         try:
             # 使用pm2或supervisor等进程管理器
             if self.deploy_config.get("process_manager") == "pm2":
-                return self._run_command(["pm2", "restart", service], project_root)
+                return await self._run_command(["pm2", "restart", service], project_root)
             elif self.deploy_config.get("process_manager") == "supervisor":
-                return self._run_command(["supervisorctl", "restart", service], project_root)
+                return await self._run_command(["supervisorctl", "restart", service], project_root)
             else:
                 logger.warning("未配置进程管理器")
                 return True
@@ -275,54 +446,46 @@ class Deployer:
             logger.error(f"重启进程管理器服务失败: {e}")
             return False
 
-    def _health_check_backend(self) -> bool:
+    async def _health_check_backend(self) -> bool:
         """后端健康检查"""
-        try:
-            import httpx
-
-            backend_url = self.deploy_config.get("backend_url", "http://localhost:8000")
-            health_url = f"{backend_url}/api/health"
+        backend_url = self.deploy_config.get("backend_url", "http://localhost:8000")
+        return await self._wait_until_healthy("后端", f"{backend_url}/api/health")
 
-            # 等待服务启动
-            time.sleep(10)
-
-            with httpx.Client(timeout=30) as client:
-                response = client.get(health_url)
-                if response.status_code == 200:
-                    logger.info("后端健康检查通过")
-                    return True
-                else:
-                    logger.error(f"后端健康检查失败: {response.status_code}")
-                    return False
-
-        except Exception as e:
-            logger.error(f"后端健康检查异常: {e}")
-            return False
-
-    def _health_check_frontend(self) -> bool:
+    async def _health_check_frontend(self) -> bool:
         """前端健康检查"""
-        try:
-            import httpx
-
-            frontend_url = self.deploy_config.get("frontend_url", "http://localhost:3000")
+        frontend_url = self.deploy_config.get("frontend_url", "http://localhost:3000")
+        return await self._wait_until_healthy("前端", frontend_url)
 
-            # 等待服务启动
-            time.sleep(10)
+    async def _wait_until_healthy(self, name: str, url: str) -> bool:
+        """指数退避轮询健康检查，服务就绪后立即返回"""
+        try:
+            deadline = time.monotonic() + self.deploy_config.get("health_check_timeout", 120)
+            delay = 0.25
+            status_code = None
+
+            while True:
+                try:
+                    response = await self._http_client.get(url)
+                    status_code = response.status_code
+                    if status_code == 200:
+                        logger.info(f"{name}健康检查通过")
+                        return True
+                except httpx.HTTPError:
+                    pass
+
+                if time.monotonic() + delay >= deadline:
+                    break
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 5)
 
-            with httpx.Client(timeout=30) as client:
-                response = client.get(frontend_url)
-                if response.status_code == 200:
-                    logger.info("前端健康检查通过")
-                    return True
-                else:
-                    logger.error(f"前端健康检查失败: {response.status_code}")
-                    return False
+            logger.error(f"{name}健康检查失败: {status_code or '服务未响应'}")
+            return False
 
         except Exception as e:
-            logger.error(f"前端健康检查异常: {e}")
+            logger.error(f"{name}健康检查异常: {e}")
             return False
 
-    def _backup_database(self) -> bool:
+    async def _backup_database(self) -> bool:
         """备份数据库"""
         try:
             backup_dir = project_root / "backups"
@@ -334,16 +497,36 @@ class Deployer:
             # 根据数据库类型执行备份命令
             db_config = self.deploy_config.get("database", {})
             db_type = db_config.get("type", "postgresql")
+            backup_jobs = str(db_config.get("backup_jobs", 4))
 
             if db_type == "postgresql":
+                # 目录格式支持多个worker并行导出各表，轻度压缩以减少磁盘IO
+                backup_file = backup_dir / f"backup_{timestamp}"
                 cmd = [
                     "pg_dump",
                     f"--host={db_config['host']}",
                     f"--port={db_config['port']}",
                     f"--username={db_config['username']}",
                     f"--dbname={db_config['database']}",
+                    "--format=directory",
+                    f"--jobs={backup_jobs}",
+                    "--compress=1",
                     f"--file={backup_file}"
                 ]
+            elif db_type == "mysql" and shutil.which("mydumper"):
+                # mydumper支持多线程导出
+                backup_file = backup_dir / f"backup_{timestamp}"
+                cmd = [
+                    "mydumper",
+                    f"--host={db_config['host']}",
+                    f"--port={db_config['port']}",
+                    f"--user={db_config['username']}",
+                    f"--password={db_config['password']}",
+                    f"--database={db_config['database']}",
+                    f"--threads={backup_jobs}",
+                    "--compress",
+                    f"--outputdir={backup_file}"
+                ]
             elif db_type == "mysql":
                 cmd = [
                     "mysqldump",
@@ -358,7 +541,7 @@ class Deployer:
                 logger.error(f"不支持的数据库类型: {db_type}")
                 return False
 
-            if self._run_command(cmd, Path.cwd()):
+            if await self._run_command(cmd, Path.cwd()):
                 logger.info(f"数据库备份成功: {backup_file}")
                 return True
             else:
@@ -368,7 +551,40 @@ class Deployer:
             logger.error(f"数据库备份失败: {e}")
             return False
 
-    def _run_sql_file(self, sql_file: Path) -> bool:
+    async def _run_migrations(self, migration_files: List[Path]) -> bool:
+        """通过单个连接在同一事务中执行全部迁移"""
+        db_config = self.deploy_config.get("database", {})
+
+        try:
+            conn = await asyncpg.connect(
+                host=db_config["host"],
+                port=db_config["port"],
+                user=db_config["username"],
+                password=db_config.get("password"),
+                database=db_config["database"]
+            )
+        except Exception as e:
+            logger.error(f"连接数据库失败: {e}")
+            return False
+
+        try:
+            await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_ID)
+            try:
+                async with conn.transaction():
+                    for migration_file in migration_files:
+                        logger.info(f"运行迁移: {migration_file.name}")
+                        await conn.execute(migration_file.read_text(encoding="utf-8"))
+            finally:
+                await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_ID)
+            return True
+
+        except Exception as e:
+            logger.error(f"执行迁移失败，已回滚: {e}")
+            return False
+        finally:
+            await conn.close()
+
+    async def _run_sql_file(self, sql_file: Path) -> bool:
         """运行SQL文件"""
         try:
             db_config = self.deploy_config.get("database", {})
@@ -397,13 +613,13 @@ class Deployer:
                 logger.error(f"不支持的数据库类型: {db_type}")
                 return False
 
-            return self._run_command(cmd, Path.cwd())
+            return await self._run_command(cmd, Path.cwd())
 
         except Exception as e:
             logger.error(f"执行SQL文件失败: {e}")
             return False
 
-    def _verify_database(self) -> bool:
+    async def _verify_database(self) -> bool:
         """验证数据库"""
         try:
             # 检查关键表是否存在
@@ -430,7 +646,7 @@ class Deployer:
                     "--execute", "SELECT COUNT(*) FROM tools LIMIT 1;"
                 ]
 
-            return self._run_command(cmd, Path.cwd())
+            return await self._run_command(cmd, Path.cwd())
 
         except Exception as e:
             logger.error(f"数据库验证失败: {e}")
@@ -448,10 +664,11 @@ class Deployer:
 
     def _generate_deploy_report(self, success_count: int, total_count: int):
         """生成部署报告"""
+        now = datetime.now()
         report = {
             "deployment": {
                 "environment": self.environment,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
                 "success_count": success_count,
                 "total_count": total_count,
                 "success_rate": f"{(success_count/total_count)*100:.1f}%",
@@ -464,14 +681,17 @@ class Deployer:
         reports_dir = project_root / "reports"
         reports_dir.mkdir(exist_ok=True)
 
-        report_file = reports_dir / f"deploy_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
+        report_file = reports_dir / f"deploy_report_{now:%Y%m%d_%H%M%S}.json"
+        if orjson:
+            report_file.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2, default=str))
+        else:
+            with open(report_file, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2, default=str)
 
         logger.info(f"部署报告已保存: {report_file}")
 
 
-def main():
+async def main():
     """主函数"""
     parser = argparse.ArgumentParser(description="部署脚本")
     parser.add_argument("--backend", action="store_true", help="部署后端")
@@ -496,18 +716,21 @@ def main():
     deployer = Deployer(environment=args.env)
     success = True
 
-    if args.all:
-        success = deployer.deploy_all()
-    else:
-        if args.backend:
-            success &= deployer.deploy_backend()
-        if args.frontend:
-            success &= deployer.deploy_frontend()
-        if args.database:
-            success &= deployer.deploy_database()
+    try:
+        if args.all:
+            success = await deployer.deploy_all()
+        else:
+            if args.backend:
+                success &= await deployer.deploy_backend()
+            if args.frontend:
+                success &= await deployer.deploy_frontend()
+            if args.database:
+                success &= await deployer.deploy_database()
+    finally:
+        await deployer.close()
 
     sys.exit(0 if success else 1)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -10,14 +10,22 @@ AutoSaaS Radar - 健康检查脚本
 4. 最新数据
 """
 
+import importlib.util
 import os
 import sys
 import json
-import requests
+import asyncio
+import httpx
 import logging
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # 可选依赖，未安装时退回标准库json
+    orjson = None
+
 # 添加项目根目录到路径
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
@@ -26,6 +34,9 @@ sys.path.append(str(project_root))
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 全部检查的总超时时间（秒），避免单项检查卡住导致报告无法生成
+CHECK_TIMEOUT = 30
+
 class HealthChecker:
     def __init__(self):
         self.status = {
@@ -33,36 +44,49 @@ class HealthChecker:
             "checks": {}
         }
 
+        # 复用进程级的全局数据库实例，初始化失败时在各项检查中报告
+        self._db_error = None
+        try:
+            from backend.database.supabase_client import db
+            self.db = db
+        except Exception as e:
+            self.db = None
+            self._db_error = e
+
+    def _get_db(self):
+        """获取共享的数据库客户端"""
+        if self.db is None:
+            raise self._db_error
+        return self.db
+
     def check_database_connection(self):
         """检查数据库连接"""
         logger.info("🔍 检查数据库连接...")
         try:
-            from backend.database.supabase_client import SupabaseClient
-
-            db_client = SupabaseClient()
+            db_client = self._get_db()
             # 尝试获取一条数据
             result = db_client.client.table('tools').select('id').limit(1).execute()
 
             if result.data:
-                self.status["checks"]["database"] = {
+                logger.info("✅ 数据库连接正常")
+                return {
                     "status": "healthy",
                     "message": "数据库连接正常",
                     "response_time": "fast"
                 }
-                logger.info("✅ 数据库连接正常")
-            else:
-                self.status["checks"]["database"] = {
-                    "status": "warning",
-                    "message": "数据库连接成功但无数据"
-                }
-                logger.warning("⚠️ 数据库连接成功但无数据")
+
+            logger.warning("⚠️ 数据库连接成功但无数据")
+            return {
+                "status": "warning",
+                "message": "数据库连接成功但无数据"
+            }
 
         except Exception as e:
-            self.status["checks"]["database"] = {
+            logger.error(f"❌ 数据库连接失败: {e}")
+            return {
                 "status": "error",
                 "message": f"数据库连接失败: {str(e)}"
             }
-            logger.error(f"❌ 数据库连接失败: {e}")
 
     def check_api_endpoints(self):
         """检查API端点"""
@@ -75,62 +99,65 @@ class HealthChecker:
             "/api/tools/stats"
         ]
 
-        api_status = {"status": "healthy", "endpoints": {}}
+        results = asyncio.run(self._probe_endpoints(f"http://{api_base}", endpoints))
 
-        for endpoint in endpoints:
-            try:
-                url = f"http://{api_base}{endpoint}"
-                response = requests.get(url, timeout=5)
+        api_status = {"status": "healthy", "endpoints": dict(zip(endpoints, results))}
+        if any(result["status"] == "error" for result in results):
+            api_status["status"] = "error"
 
-                if response.status_code == 200:
-                    api_status["endpoints"][endpoint] = {
-                        "status": "healthy",
-                        "status_code": response.status_code,
-                        "response_time": response.elapsed.total_seconds()
-                    }
-                    logger.info(f"✅ {endpoint} - {response.status_code}")
-                else:
-                    api_status["endpoints"][endpoint] = {
-                        "status": "error",
-                        "status_code": response.status_code,
-                        "message": response.text
-                    }
-                    logger.error(f"❌ {endpoint} - {response.status_code}")
-                    api_status["status"] = "error"
+        return api_status
 
-            except Exception as e:
-                api_status["endpoints"][endpoint] = {
+    async def _probe_endpoints(self, base_url, endpoints):
+        """通过同一个连接池并发请求各端点"""
+        async with httpx.AsyncClient(base_url=base_url, timeout=5) as client:
+            responses = await asyncio.gather(
+                *(client.get(endpoint) for endpoint in endpoints),
+                return_exceptions=True
+            )
+
+        results = []
+        for endpoint, response in zip(endpoints, responses):
+            if isinstance(response, Exception):
+                logger.error(f"❌ {endpoint} - 连接失败: {response}")
+                results.append({
                     "status": "error",
-                    "message": str(e)
-                }
-                logger.error(f"❌ {endpoint} - 连接失败: {e}")
-                api_status["status"] = "error"
+                    "message": str(response)
+                })
+            elif response.status_code == 200:
+                logger.info(f"✅ {endpoint} - {response.status_code}")
+                results.append({
+                    "status": "healthy",
+                    "status_code": response.status_code,
+                    "response_time": response.elapsed.total_seconds()
+                })
+            else:
+                logger.error(f"❌ {endpoint} - {response.status_code}")
+                results.append({
+                    "status": "error",
+                    "status_code": response.status_code,
+                    "message": response.text
+                })
 
-        self.status["checks"]["api"] = api_status
+        return results
 
     def check_latest_data(self):
         """检查最新数据"""
         logger.info("🔍 检查最新数据...")
         try:
-            from backend.database.supabase_client import SupabaseClient
+            db_client = self._get_db()
 
-            db_client = SupabaseClient()
-
-            # 检查今天是否有新数据
+            # 由数据库统计数量，count=exact 的总数不受limit影响，只返回一行数据
             today = datetime.now().date()
-            result = db_client.client.table('tools').select('id, created_at')\
+            today_count = db_client.client.table('tools').select('id', count='exact')\
                 .gte('created_at', today.isoformat())\
-                .execute()
-
-            today_count = len(result.data)
+                .limit(1)\
+                .execute().count or 0
 
-            # 检查最近7天的数据
             week_ago = (datetime.now() - timedelta(days=7)).date()
-            week_result = db_client.client.table('tools').select('id, created_at')\
+            week_count = db_client.client.table('tools').select('id', count='exact')\
                 .gte('created_at', week_ago.isoformat())\
-                .execute()
-
-            week_count = len(week_result.data)
+                .limit(1)\
+                .execute().count or 0
 
             data_status = {
                 "today_count": today_count,
@@ -138,10 +165,14 @@ class HealthChecker:
                 "last_updated": None
             }
 
-            if week_result.data:
+            if week_count:
                 # 获取最新数据时间
-                latest = max(week_result.data, key=lambda x: x['created_at'])
-                data_status["last_updated"] = latest['created_at']
+                latest = db_client.client.table('tools').select('created_at')\
+                    .order('created_at', desc=True)\
+                    .limit(1)\
+                    .execute()
+                if latest.data:
+                    data_status["last_updated"] = latest.data[0]['created_at']
 
             if today_count > 0:
                 data_status["status"] = "healthy"
@@ -156,14 +187,14 @@ class HealthChecker:
                 data_status["message"] = "最近一周无数据"
                 logger.error("❌ 最近一周无数据")
 
-            self.status["checks"]["data"] = data_status
+            return data_status
 
         except Exception as e:
-            self.status["checks"]["data"] = {
+            logger.error(f"❌ 数据检查失败: {e}")
+            return {
                 "status": "error",
                 "message": f"数据检查失败: {str(e)}"
             }
-            logger.error(f"❌ 数据检查失败: {e}")
 
     def check_dependencies(self):
         """检查依赖项"""
@@ -180,12 +211,12 @@ class HealthChecker:
             "fastapi"
         ]
 
+        # 只查找模块位置，不执行包的 __init__
         for package in required_packages:
-            try:
-                __import__(package)
+            if importlib.util.find_spec(package) is not None:
                 deps_status["dependencies"][package] = "installed"
                 logger.info(f"✅ {package} - 已安装")
-            except ImportError:
+            else:
                 deps_status["dependencies"][package] = "missing"
                 deps_status["status"] = "error"
                 logger.error(f"❌ {package} - 未安装")
@@ -206,21 +237,47 @@ class HealthChecker:
                 deps_status["status"] = "error"
                 logger.error(f"❌ {env_var} - 未设置")
 
-        self.status["checks"]["dependencies"] = deps_status
+        return deps_status
 
     def run_all_checks(self):
         """运行所有健康检查"""
         logger.info("🏥 开始健康检查...")
 
-        self.check_database_connection()
-        self.check_api_endpoints()
-        self.check_latest_data()
-        self.check_dependencies()
+        # 各项检查互不依赖，并发执行；检查返回结果，由这里统一写入报告
+        checks = {
+            "database": self.check_database_connection,
+            "api": self.check_api_endpoints,
+            "data": self.check_latest_data,
+            "dependencies": self.check_dependencies
+        }
+
+        executor = ThreadPoolExecutor(max_workers=len(checks))
+        futures = {executor.submit(check): name for name, check in checks.items()}
+        done, _ = wait(futures, timeout=CHECK_TIMEOUT)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        # 只采用按时完成的结果，超时仍在运行的检查其返回值被丢弃，不会再改动报告
+        for future, name in futures.items():
+            if future in done:
+                try:
+                    self.status["checks"][name] = future.result()
+                except Exception as e:
+                    self.status["checks"][name] = {
+                        "status": "error",
+                        "message": f"检查异常: {str(e)}"
+                    }
+                    logger.error(f"❌ {name} 检查异常: {e}")
+            else:
+                self.status["checks"][name] = {
+                    "status": "timeout",
+                    "message": f"检查超时（>{CHECK_TIMEOUT}s）"
+                }
+                logger.error(f"❌ {name} 检查超时")
 
         # 计算整体状态
         all_statuses = [check.get("status", "unknown") for check in self.status["checks"].values()]
 
-        if "error" in all_statuses:
+        if "error" in all_statuses or "timeout" in all_statuses:
             overall_status = "error"
         elif "warning" in all_statuses:
             overall_status = "warning"
@@ -238,8 +295,12 @@ class HealthChecker:
 
         os.makedirs("logs", exist_ok=True)
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.status, f, indent=2, ensure_ascii=False)
+        if orjson:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(self.status, option=orjson.OPT_INDENT_2, default=str))
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(self.status, f, indent=2, ensure_ascii=False, default=str)
 
         logger.info(f"📄 健康检查报告已保存: {filename}")
         return filename
@@ -6,20 +6,30 @@
 
 import argparse
 import asyncio
+import hashlib
 import json
 import logging
+import mmap
+import os
+import re
 import smtplib
 import sys
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from email.mime.text import MimeText
-from email.mime.multipart import MimeMultipart
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
 from pathlib import Path
 from typing import Dict, List, Optional
 
 import httpx
 import psutil
 
+try:
+    import orjson
+except ImportError:  # 可选依赖，未安装时退回标准库json
+    orjson = None
+
 # 项目根目录
 project_root = Path(__file__).parent.parent
 
@@ -35,14 +45,91 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# 日志行开头的时间戳，与logging默认的asctime格式一致
+_LOG_TS_RE = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d+)')
+
+# 首次扫描日志文件时只读取末尾的字节数
+LOG_TAIL_BYTES = 256 * 1024
+
+# 告警去重窗口及最多记录的告警数
+ALERT_DEDUP_TTL = timedelta(hours=1)
+ALERT_DEDUP_MAXSIZE = 1024
+
+# 告警合并窗口（秒），窗口内的告警合并为一次发送
+ALERT_DEBOUNCE_SECONDS = 5
+
+# 自适应检查间隔（秒）：异常时缩短到最小值，持续健康时逐步放宽到最大值
+MONITOR_INTERVAL = 60
+MONITOR_MIN_INTERVAL = 15
+MONITOR_MAX_INTERVAL = 300
+
 
 class SystemMonitor:
     """系统监控器"""
 
     def __init__(self):
         self.config = self._load_config()
-        self.alerts_sent = {}
+        # 按发送时间排序的告警记录，过期或超出上限时从头部淘汰
+        self.alerts_sent: "OrderedDict[str, datetime]" = OrderedDict()
+        self._alert_queue: asyncio.Queue = asyncio.Queue()
+        self._interval = MONITOR_INTERVAL
+        # 首次调用cpu_percent(interval=None)的结果无意义，先取一次作为基准
+        psutil.cpu_percent(interval=None)
         self.monitoring_data = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        # 检查结果短期缓存及进行中的检查，合并并发调用
+        self._cache: Dict[str, tuple] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.cache_ttl = self.config.get("cache_ttl", 5)
+        # 每个日志文件已扫描到的位置，后续只读取新增内容
+        self._log_offsets: Dict[Path, int] = {}
+        self._error_re = re.compile(
+            b"|".join(re.escape(p.encode("utf-8")) for p in self.config["logs"]["patterns"]),
+            re.IGNORECASE
+        )
+
+    async def _cached(self, key: str, fn, use_cache: bool = True):
+        """在TTL内复用检查结果，并发调用共享同一次执行"""
+        if use_cache:
+            cached = self._cache.get(key)
+            if cached and time.monotonic() - cached[0] < self.cache_ttl:
+                return cached[1]
+
+            if key in self._inflight:
+                return await asyncio.shield(self._inflight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = fn()
+            if asyncio.iscoroutine(result):
+                result = await result
+            self._cache[key] = (time.monotonic(), result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            # 标记异常已被获取，避免无人等待时产生告警
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """获取长期复用的HTTP客户端，跨监控轮次保持连接"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=30,
+                limits=httpx.Limits(max_keepalive_connections=100, max_connections=200)
+            )
+        return self._client
+
+    async def close(self):
+        """关闭HTTP客户端"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     def _load_config(self) -> Dict:
         """加载监控配置"""
@@ -94,64 +181,77 @@ class SystemMonitor:
 
             return default_config
 
-        with open(config_file, 'r') as f:
-            return json.load(f)
+        data = config_file.read_bytes()
+        return orjson.loads(data) if orjson else json.loads(data)
+
+    async def run_health_checks(self, use_cache: bool = True, timestamp: Optional[str] = None) -> Dict:
+        """运行健康检查（结果短期缓存）"""
+        return await self._cached(
+            "health", lambda: self._run_health_checks(timestamp), use_cache
+        )
 
-    async def run_health_checks(self) -> Dict:
+    async def _run_health_checks(self, timestamp: Optional[str] = None) -> Dict:
         """运行健康检查"""
+        timestamp = timestamp or datetime.now().isoformat()
         if not self.config["health_checks"]["enabled"]:
             return {}
 
-        results = {}
         endpoints = self.config["health_checks"]["endpoints"]
+        alerts = []
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            for endpoint in endpoints:
-                name = endpoint["name"]
-                url = endpoint["url"]
-
-                try:
-                    start_time = time.time()
-                    response = await client.get(url)
-                    response_time = (time.time() - start_time) * 1000
-
-                    results[name] = {
-                        "status": "healthy" if response.status_code == 200 else "unhealthy",
-                        "status_code": response.status_code,
-                        "response_time_ms": round(response_time, 2),
-                        "timestamp": datetime.now().isoformat()
-                    }
+        async def probe(client: httpx.AsyncClient, endpoint: Dict):
+            name = endpoint["name"]
+            url = endpoint["url"]
 
-                    # 检查响应时间
-                    if response_time > 5000:  # 5秒
-                        await self._send_alert(
-                            f"High response time for {name}",
-                            f"Response time: {response_time:.2f}ms"
-                        )
-
-                except Exception as e:
-                    results[name] = {
-                        "status": "error",
-                        "error": str(e),
-                        "timestamp": datetime.now().isoformat()
-                    }
+            try:
+                start_time = time.time()
+                response = await client.get(url)
+                response_time = (time.time() - start_time) * 1000
+
+                # 检查响应时间
+                if response_time > 5000:  # 5秒
+                    alerts.append((
+                        f"High response time for {name}",
+                        f"Response time: {response_time:.2f}ms"
+                    ))
+
+                return name, {
+                    "status": "healthy" if response.status_code == 200 else "unhealthy",
+                    "status_code": response.status_code,
+                    "response_time_ms": round(response_time, 2),
+                    "timestamp": timestamp
+                }
 
-                    await self._send_alert(
-                        f"Health check failed for {name}",
-                        f"Error: {str(e)}"
-                    )
+            except Exception as e:
+                alerts.append((
+                    f"Health check failed for {name}",
+                    f"Error: {str(e)}"
+                ))
+
+                return name, {
+                    "status": "error",
+                    "error": str(e),
+                    "timestamp": timestamp
+                }
+
+        # 并发探测所有端点，探测完成后再统一发送告警
+        client = await self._get_client()
+        results = dict(await asyncio.gather(*(probe(client, endpoint) for endpoint in endpoints)))
+
+        if alerts:
+            await asyncio.gather(*(self._send_alert(subject, message) for subject, message in alerts))
 
         return results
 
-    def get_system_metrics(self) -> Dict:
+    def get_system_metrics(self, timestamp: Optional[str] = None) -> Dict:
         """获取系统指标"""
         if not self.config["system_metrics"]["enabled"]:
             return {}
 
         thresholds = self.config["system_metrics"]["thresholds"]
 
-        # CPU使用率
-        cpu_percent = psutil.cpu_percent(interval=1)
+        # CPU使用率（自上次调用以来的平均值，不阻塞事件循环）
+        cpu_percent = psutil.cpu_percent(interval=None)
 
         # 内存使用率
         memory = psutil.virtual_memory()
@@ -167,7 +267,7 @@ class SystemMonitor:
             "disk_percent": disk_percent,
             "memory_available_gb": round(memory.available / (1024**3), 2),
             "disk_free_gb": round(disk.free / (1024**3), 2),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp or datetime.now().isoformat()
         }
 
         # 检查阈值
@@ -190,12 +290,15 @@ class SystemMonitor:
 
         return metrics
 
-    def check_logs(self) -> List[Dict]:
+    async def check_logs(self, use_cache: bool = True) -> List[Dict]:
+        """检查日志错误（结果短期缓存）"""
+        return await self._cached("logs", self._check_logs, use_cache)
+
+    def _check_logs(self) -> List[Dict]:
         """检查日志错误"""
         if not self.config["logs"]["enabled"]:
             return []
 
-        error_patterns = self.config["logs"]["patterns"]
         log_files = [
             project_root / "logs" / "daily_scan.log",
             project_root / "logs" / "scheduler.log",
@@ -204,39 +307,64 @@ class SystemMonitor:
         ]
 
         errors = []
+        # 日志时间戳为定长的 "YYYY-MM-DD HH:MM:SS"，按字符串比较即可判断先后，无需逐行解析
+        cutoff_str = (datetime.now() - timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S')
 
         for log_file in log_files:
-            if not log_file.exists():
+            try:
+                size = os.stat(log_file).st_size
+            except FileNotFoundError:
                 continue
 
             try:
-                # 检查最近1小时的日志
-                cutoff_time = datetime.now() - timedelta(hours=1)
-                recent_errors = []
-
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        # 检查时间戳
-                        try:
-                            line_time_str = line.split(' - ')[0]
-                            line_time = datetime.strptime(line_time_str, '%Y-%m-%d %H:%M:%S,%f')
-
-                            if line_time < cutoff_time:
-                                continue
-                        except:
+                # 从上次扫描位置继续；首次扫描或文件被轮转时只读取末尾部分
+                offset = self._log_offsets.get(log_file)
+                if offset is None or offset > size:
+                    offset = max(0, size - LOG_TAIL_BYTES)
+                    skip_partial = offset > 0
+                else:
+                    skip_partial = False
+
+                if offset >= size:
+                    self._log_offsets[log_file] = size
+                    continue
+
+                with open(log_file, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # 只处理完整的行，未写完的行留到下次
+                    end = mm.rfind(b"\n", offset, size) + 1
+                    if end == 0:
+                        continue
+                    self._log_offsets[log_file] = end
+
+                    start = offset
+                    if skip_partial:
+                        start = mm.find(b"\n", offset, end) + 1
+
+                    # 直接在映射的字节上匹配错误模式，只为命中的行解析时间戳
+                    last_line_start = -1
+                    for hit in self._error_re.finditer(mm, start, end):
+                        line_start = max(mm.rfind(b"\n", start, hit.start()) + 1, start)
+                        if line_start == last_line_start:
+                            continue
+                        last_line_start = line_start
+
+                        line_end = mm.find(b"\n", hit.end(), end)
+                        line = mm[line_start:line_end].decode('utf-8', errors='replace')
+
+                        match = _LOG_TS_RE.match(line)
+                        if not match:
                             continue
 
-                        # 检查错误模式
-                        line_lower = line.lower()
-                        if any(pattern.lower() in line_lower for pattern in error_patterns):
-                            recent_errors.append({
-                                "file": log_file.name,
-                                "timestamp": line_time_str,
-                                "message": line.strip()
-                            })
+                        line_time_str = match.group(1)
+                        if line_time_str[:19] < cutoff_str:
+                            continue
 
-                if recent_errors:
-                    errors.extend(recent_errors)
+                        errors.append({
+                            "file": log_file.name,
+                            "timestamp": line_time_str,
+                            "message": line.strip()
+                        })
 
             except Exception as e:
                 logger.warning(f"检查日志文件 {log_file} 失败: {e}")
@@ -251,15 +379,45 @@ class SystemMonitor:
         return errors
 
     async def _send_alert(self, subject: str, message: str):
-        """发送告警"""
-        alert_key = f"{subject}:{message}"
+        """将告警加入待发送队列（去重后由合并任务统一发送）"""
+        alert_key = hashlib.blake2b(f"{subject}:{message}".encode("utf-8"), digest_size=16).hexdigest()
         current_time = datetime.now()
 
+        # 淘汰已过期的记录
+        while self.alerts_sent:
+            oldest_sent = next(iter(self.alerts_sent.values()))
+            if current_time - oldest_sent < ALERT_DEDUP_TTL:
+                break
+            self.alerts_sent.popitem(last=False)
+
         # 避免重复发送（1小时内不重复）
         if alert_key in self.alerts_sent:
-            last_sent = self.alerts_sent[alert_key]
-            if current_time - last_sent < timedelta(hours=1):
-                return
+            return
+
+        self.alerts_sent[alert_key] = current_time
+        if len(self.alerts_sent) > ALERT_DEDUP_MAXSIZE:
+            self.alerts_sent.popitem(last=False)
+
+        self._alert_queue.put_nowait((subject, message))
+        logger.warning(f"告警已加入队列: {subject}")
+
+    async def flush_alerts(self):
+        """取出队列中的全部告警，合并为一次发送"""
+        # 让已创建但尚未执行的告警任务先入队
+        await asyncio.sleep(0)
+
+        alerts = []
+        while not self._alert_queue.empty():
+            alerts.append(self._alert_queue.get_nowait())
+
+        if not alerts:
+            return
+
+        if len(alerts) == 1:
+            subject, message = alerts[0]
+        else:
+            subject = f"{len(alerts)} 条告警"
+            message = "\n".join(f"- {s}: {m}" for s, m in alerts)
 
         # 邮件告警
         if self.config["alerts"]["email"]["enabled"]:
@@ -269,15 +427,23 @@ class SystemMonitor:
         if self.config["alerts"]["webhook"]["enabled"]:
             await self._send_webhook_alert(subject, message)
 
-        self.alerts_sent[alert_key] = current_time
         logger.warning(f"告警已发送: {subject}")
 
+    async def _drain_alerts(self):
+        """按合并窗口周期性发送队列中的告警"""
+        while True:
+            await asyncio.sleep(ALERT_DEBOUNCE_SECONDS)
+            try:
+                await self.flush_alerts()
+            except Exception as e:
+                logger.error(f"发送合并告警失败: {e}")
+
     async def _send_email_alert(self, subject: str, message: str):
         """发送邮件告警"""
         try:
             email_config = self.config["alerts"]["email"]
 
-            msg = MimeMultipart()
+            msg = MIMEMultipart()
             msg['From'] = email_config["username"]
             msg['To'] = ", ".join(email_config["recipients"])
             msg['Subject'] = f"[AutoSaaS Radar Alert] {subject}"
@@ -292,17 +458,22 @@ class SystemMonitor:
 AutoSaaS Radar 监控系统
             """
 
-            msg.attach(MimeText(body, 'plain', 'utf-8'))
+            msg.attach(MIMEText(body, 'plain', 'utf-8'))
 
-            server = smtplib.SMTP(email_config["smtp_host"], email_config["smtp_port"])
-            server.starttls()
-            server.login(email_config["username"], email_config["password"])
-            server.send_message(msg)
-            server.quit()
+            # smtplib是阻塞调用，放到线程中执行以免卡住事件循环
+            await asyncio.to_thread(self._smtp_send, email_config, msg)
 
         except Exception as e:
             logger.error(f"发送邮件告警失败: {e}")
 
+    @staticmethod
+    def _smtp_send(email_config: Dict, msg: MIMEMultipart):
+        """通过SMTP同步发送邮件"""
+        with smtplib.SMTP(email_config["smtp_host"], email_config["smtp_port"], timeout=30) as server:
+            server.starttls()
+            server.login(email_config["username"], email_config["password"])
+            server.send_message(msg)
+
     async def _send_webhook_alert(self, subject: str, message: str):
         """发送Webhook告警"""
         try:
@@ -316,9 +487,9 @@ AutoSaaS Radar 监控系统
                 "service": "autosaas-radar"
             }
 
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.post(webhook_url, json=payload)
-                response.raise_for_status()
+            client = await self._get_client()
+            response = await client.post(webhook_url, json=payload)
+            response.raise_for_status()
 
         except Exception as e:
             logger.error(f"发送Webhook告警失败: {e}")
@@ -326,48 +497,79 @@ AutoSaaS Radar 监控系统
     async def run_monitoring(self, daemon: bool = False):
         """运行监控"""
         logger.info("启动系统监控...")
+        drain_task = asyncio.create_task(self._drain_alerts())
 
         try:
             while True:
+                # 本轮所有结果共用同一个时间戳，便于关联
+                now = datetime.now()
+                iso_now = now.isoformat()
+
                 # 健康检查
-                health_results = await self.run_health_checks()
+                health_results = await self.run_health_checks(timestamp=iso_now)
                 if health_results:
                     self.monitoring_data["health"] = health_results
 
                 # 系统指标
-                system_metrics = self.get_system_metrics()
+                system_metrics = self.get_system_metrics(timestamp=iso_now)
                 if system_metrics:
                     self.monitoring_data["system"] = system_metrics
 
                 # 日志检查
-                log_errors = self.check_logs()
+                log_errors = await self.check_logs()
                 if log_errors:
                     self.monitoring_data["errors"] = log_errors
 
                 # 保存监控数据
-                self._save_monitoring_data()
+                self._save_monitoring_data(now)
 
                 if not daemon:
                     break
 
                 # 等待下次检查
-                await asyncio.sleep(60)  # 1分钟检查一次
+                self._adjust_interval(health_results, log_errors)
+                await asyncio.sleep(self._interval)
 
         except KeyboardInterrupt:
             logger.info("监控已停止")
         except Exception as e:
             logger.error(f"监控异常: {e}")
+        finally:
+            drain_task.cancel()
+            await self.flush_alerts()
+            await self.close()
+
+    def _adjust_interval(self, health_results: Dict, log_errors: List[Dict]):
+        """根据本轮结果调整检查间隔"""
+        degraded = bool(log_errors) or any(
+            result.get("status") != "healthy" for result in health_results.values()
+        )
+
+        if degraded:
+            self._interval = MONITOR_MIN_INTERVAL
+        else:
+            self._interval = min(MONITOR_MAX_INTERVAL, max(self._interval, MONITOR_INTERVAL) * 1.5)
+
+        logger.debug(f"下次检查间隔: {self._interval:.0f}s")
 
-    def _save_monitoring_data(self):
+    def _save_monitoring_data(self, now: Optional[datetime] = None):
         """保存监控数据"""
         try:
             monitor_dir = project_root / "monitor"
             monitor_dir.mkdir(exist_ok=True)
 
-            data_file = monitor_dir / f"monitor_{datetime.now().strftime('%Y%m%d')}.json"
+            # 每轮追加一行JSON，写入量只与本轮数据有关，读取方也不会看到写了一半的文件
+            now = now or datetime.now()
+            data_file = monitor_dir / f"monitor_{now.strftime('%Y%m%d')}.jsonl"
+            entry = {"ts": now.isoformat(), **self.monitoring_data}
+
+            if orjson:
+                line = orjson.dumps(entry, default=str) + b"\n"
+            else:
+                line = (json.dumps(entry, ensure_ascii=False, default=str) + "\n").encode("utf-8")
 
-            with open(data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.monitoring_data, f, ensure_ascii=False, indent=2)
+            with open(data_file, 'ab') as f:
+                f.write(line)
 
         except Exception as e:
             logger.error(f"保存监控数据失败: {e}")
@@ -403,7 +605,7 @@ async def main():
             results = await monitor.run_health_checks()
             print(json.dumps(results, indent=2, ensure_ascii=False))
         elif args.logs:
-            errors = monitor.check_logs()
+            errors = await monitor.check_logs()
             print(json.dumps(errors, indent=2, ensure_ascii=False))
         elif args.alerts:
             await monitor._send_alert("测试告警", "这是一条测试告警消息")
@@ -414,6 +616,9 @@ async def main():
     except Exception as e:
         logger.error(f"监控运行失败: {e}")
         sys.exit(1)
+    finally:
+        await monitor.flush_alerts()
+        await monitor.close()
 
 
 if __name__ == "__main__":
@@ -1,24 +1,42 @@
 #!/usr/bin/env python3
 """
 快速测试脚本 - 验证系统各模块功能
-用法: python quick_test.py [--backend] [--frontend] [--database] [--all] [--verbose]
+用法: python quick_test.py [--backend] [--frontend] [--database] [--all] [--verbose] [--fail-fast]
 """
 
 import argparse
 import asyncio
 import json
 import logging
+import os
 import sys
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # 可选依赖，未安装时退回标准库json
+    orjson = None
+
+try:
+    import h2  # noqa: F401  httpx的HTTP/2支持依赖h2
+    HTTP2_AVAILABLE = True
+except ImportError:  # 未安装时使用HTTP/1.1
+    HTTP2_AVAILABLE = False
+
 # 项目根目录
 project_root = Path(__file__).parent.parent
 
+# 脚本目录
+SCRIPTS_DIR = str(project_root / "scripts")
+
+# 端点校验缓存（ETag / Last-Modified），跨次运行复用
+PROBE_CACHE_FILE = project_root / "reports" / ".probe_cache.json"
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -28,6 +46,10 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class ModuleFailedError(Exception):
+    """测试模块失败，快速失败模式下用于取消其余模块"""
+
+
 class QuickTester:
     """快速测试器"""
 
@@ -35,6 +57,8 @@ class QuickTester:
         self.verbose = verbose
         self.test_results = {}
         self.start_time = time.time()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._probe_cache = self._load_probe_cache()
 
     def log(self, message: str, level: str = "INFO"):
         """日志输出"""
@@ -45,6 +69,95 @@ class QuickTester:
         elif self.verbose or level == "INFO":
             logger.info(message)
 
+    def _get_client(self) -> httpx.AsyncClient:
+        """获取各测试模块共用的HTTP客户端"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=30,
+                limits=httpx.Limits(
+                    max_keepalive_connections=32,
+                    max_connections=64,
+                    keepalive_expiry=30.0
+                )
+            )
+        return self._client
+
+    async def close(self):
+        """关闭HTTP客户端"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _load_probe_cache(self) -> Dict:
+        """加载上次运行保存的端点校验缓存"""
+        try:
+            with open(PROBE_CACHE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_probe_cache(self):
+        """保存端点校验缓存"""
+        try:
+            PROBE_CACHE_FILE.parent.mkdir(exist_ok=True)
+            with open(PROBE_CACHE_FILE, 'w', encoding='utf-8') as f:
+                json.dump(self._probe_cache, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            self.log(f"保存端点校验缓存失败: {e}", "WARNING")
+
+    async def _probe(self, client: httpx.AsyncClient, url: str, method: str, name: str) -> Dict:
+        """探测单个端点，返回测试结果"""
+        self.log(f"  测试: {name} - {method} {url}")
+
+        try:
+            headers = {}
+            cached = self._probe_cache.get(url) if method == "GET" else None
+            if cached:
+                if cached.get("etag"):
+                    headers["If-None-Match"] = cached["etag"]
+                if cached.get("last_modified"):
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
+            response = await client.request(method, url, headers=headers)
+            if method == "HEAD" and response.status_code == 405:
+                # 服务端不支持HEAD时退回GET
+                response = await client.get(url)
+        except Exception as e:
+            self.log(f"    ❌ {name} - 连接失败: {str(e)}", "ERROR")
+            return {
+                "url": url,
+                "method": method,
+                "success": False,
+                "error": str(e),
+                "message": f"连接失败: {str(e)}"
+            }
+
+        # 304表示内容未变化，同样视为成功
+        success = response.status_code in (200, 304)
+        if response.status_code == 200 and method == "GET":
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self._probe_cache[url] = {"etag": etag, "last_modified": last_modified}
+            else:
+                self._probe_cache.pop(url, None)
+
+        if success:
+            self.log(f"    ✅ {name} - {response.status_code}")
+        else:
+            self.log(f"    ❌ {name} - {response.status_code}", "ERROR")
+
+        return {
+            "url": url,
+            "method": method,
+            "status_code": response.status_code,
+            "response_time_ms": round(response.elapsed.total_seconds() * 1000, 2),
+            "content_length": response.headers.get("content-length"),
+            "success": success,
+            "message": "成功" if success else f"HTTP {response.status_code}"
+        }
+
     async def test_backend(self) -> Tuple[bool, Dict]:
         """测试后端服务"""
         self.log("开始测试后端服务...")
@@ -67,48 +180,18 @@ class QuickTester:
             {"path": "/api/tools/trending", "method": "GET", "description": "趋势工具"}
         ]
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            for endpoint in endpoints:
-                test_name = endpoint["description"]
-                url = f"{backend_url}{endpoint['path']}"
-                method = endpoint["method"]
-
-                try:
-                    self.log(f"  测试: {test_name} - {method} {url}")
-
-                    if method == "GET":
-                        response = await client.get(url)
-                    else:
-                        continue
-
-                    success = response.status_code == 200
-
-                    results["tests"][test_name] = {
-                        "url": url,
-                        "method": method,
-                        "status_code": response.status_code,
-                        "response_time_ms": round(response.elapsed.total_seconds() * 1000, 2),
-                        "success": success,
-                        "message": "成功" if success else f"HTTP {response.status_code}"
-                    }
-
-                    if success:
-                        self.log(f"    ✅ {test_name} - {response.status_code}")
-                    else:
-                        self.log(f"    ❌ {test_name} - {response.status_code}", "ERROR")
-                        overall_success = False
-
-                except Exception as e:
-                    results["tests"][test_name] = {
-                        "url": url,
-                        "method": method,
-                        "success": False,
-                        "error": str(e),
-                        "message": f"连接失败: {str(e)}"
-                    }
+        client = self._get_client()
+        probes = await asyncio.gather(
+            *[self._probe(client, f"{backend_url}{endpoint['path']}", endpoint["method"], endpoint["description"])
+              for endpoint in endpoints],
+            return_exceptions=True
+        )
 
-                    self.log(f"    ❌ {test_name} - 连接失败: {str(e)}", "ERROR")
-                    overall_success = False
+        for endpoint, probe in zip(endpoints, probes):
+            if isinstance(probe, BaseException):
+                probe = {"success": False, "error": str(probe), "message": f"测试异常: {str(probe)}"}
+            results["tests"][endpoint["description"]] = probe
+            overall_success &= probe["success"]
 
         results["overall_status"] = "success" if overall_success else "failed"
         return overall_success, results
@@ -126,48 +209,25 @@ class QuickTester:
         frontend_url = "http://localhost:3000"
         overall_success = True
 
-        # 测试页面
+        # 测试页面（只需状态码，用HEAD避免下载整页HTML）
         pages = [
             {"path": "/", "description": "首页"},
             {"path": "/explore", "description": "探索页面"},
             {"path": "/trends", "description": "趋势页面"}
         ]
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            for page in pages:
-                test_name = page["description"]
-                url = f"{frontend_url}{page['path']}"
-
-                try:
-                    self.log(f"  测试: {test_name} - {url}")
-
-                    response = await client.get(url)
-                    success = response.status_code == 200
-
-                    results["tests"][test_name] = {
-                        "url": url,
-                        "status_code": response.status_code,
-                        "response_time_ms": round(response.elapsed.total_seconds() * 1000, 2),
-                        "success": success,
-                        "message": "成功" if success else f"HTTP {response.status_code}"
-                    }
-
-                    if success:
-                        self.log(f"    ✅ {test_name} - {response.status_code}")
-                    else:
-                        self.log(f"    ❌ {test_name} - {response.status_code}", "ERROR")
-                        overall_success = False
-
-                except Exception as e:
-                    results["tests"][test_name] = {
-                        "url": url,
-                        "success": False,
-                        "error": str(e),
-                        "message": f"连接失败: {str(e)}"
-                    }
+        client = self._get_client()
+        probes = await asyncio.gather(
+            *[self._probe(client, f"{frontend_url}{page['path']}", "HEAD", page["description"])
+              for page in pages],
+            return_exceptions=True
+        )
 
-                    self.log(f"    ❌ {test_name} - 连接失败: {str(e)}", "ERROR")
-                    overall_success = False
+        for page, probe in zip(pages, probes):
+            if isinstance(probe, BaseException):
+                probe = {"success": False, "error": str(probe), "message": f"测试异常: {str(probe)}"}
+            results["tests"][page["description"]] = probe
+            overall_success &= probe["success"]
 
         results["overall_status"] = "success" if overall_success else "failed"
         return overall_success, results
@@ -218,6 +278,44 @@ class QuickTester:
         results["overall_status"] = "success" if overall_success else "failed"
         return overall_success, results
 
+    def _check_script(self, script: Dict, available: set) -> Dict:
+        """编译脚本以校验语法，返回测试结果"""
+        test_name = script["description"]
+        script_path = os.path.join(SCRIPTS_DIR, script["file"])
+
+        self.log(f"  测试: {test_name}")
+
+        if script["file"] not in available:
+            self.log(f"    ❌ {test_name} - 文件不存在", "ERROR")
+            return {
+                "success": False,
+                "message": "脚本文件不存在"
+            }
+
+        try:
+            with open(script_path, 'rb') as f:
+                compile(f.read(), script_path, 'exec')
+        except SyntaxError as e:
+            self.log(f"    ❌ {test_name} - 语法错误: {str(e)}", "ERROR")
+            return {
+                "success": False,
+                "error": str(e),
+                "message": f"脚本存在语法错误: {str(e)}"
+            }
+        except Exception as e:
+            self.log(f"    ❌ {test_name} - 异常: {str(e)}", "ERROR")
+            return {
+                "success": False,
+                "error": str(e),
+                "message": f"测试异常: {str(e)}"
+            }
+
+        self.log(f"    ✅ {test_name} - 语法检查通过")
+        return {
+            "success": True,
+            "message": "脚本存在且语法正确"
+        }
+
     async def test_scripts(self) -> Tuple[bool, Dict]:
         """测试脚本功能"""
         self.log("开始测试脚本功能...")
@@ -230,7 +328,7 @@ class QuickTester:
 
         overall_success = True
 
-        # 测试脚本文件存在性
+        # 测试脚本文件存在性及语法
         scripts = [
             {"file": "daily_scan.py", "description": "每日扫描脚本"},
             {"file": "scheduler.py", "description": "调度器脚本"},
@@ -238,56 +336,59 @@ class QuickTester:
             {"file": "monitor.py", "description": "监控脚本"}
         ]
 
-        for script in scripts:
-            test_name = script["description"]
-            script_path = project_root / "scripts" / script["file"]
-
-            try:
-                self.log(f"  测试: {test_name}")
+        # 一次列目录代替逐个stat判断文件是否存在
+        try:
+            available = set(os.listdir(SCRIPTS_DIR))
+        except FileNotFoundError:
+            available = set()
 
-                if script_path.exists():
-                    # 尝试导入脚本模块
-                    import importlib.util
-                    spec = importlib.util.spec_from_file_location(script["file"], script_path)
+        # 各脚本的读取与编译相互独立，放到线程中并行执行
+        checks = await asyncio.gather(
+            *(asyncio.to_thread(self._check_script, script, available) for script in scripts)
+        )
 
-                    if spec and spec.loader:
-                        results["tests"][test_name] = {
-                            "success": True,
-                            "message": "脚本存在且可导入"
-                        }
-                        self.log(f"    ✅ {test_name} - 存在且可导入")
-                    else:
-                        results["tests"][test_name] = {
-                            "success": False,
-                            "message": "脚本存在但无法导入"
-                        }
-                        self.log(f"    ❌ {test_name} - 存在但无法导入", "ERROR")
-                        overall_success = False
-                else:
-                    results["tests"][test_name] = {
-                        "success": False,
-                        "message": "脚本文件不存在"
-                    }
-                    self.log(f"    ❌ {test_name} - 文件不存在", "ERROR")
-                    overall_success = False
-
-            except Exception as e:
-                results["tests"][test_name] = {
-                    "success": False,
-                    "error": str(e),
-                    "message": f"测试异常: {str(e)}"
-                }
-
-                self.log(f"    ❌ {test_name} - 异常: {str(e)}", "ERROR")
-                overall_success = False
+        for script, check in zip(scripts, checks):
+            results["tests"][script["description"]] = check
+            overall_success &= check["success"]
 
         results["overall_status"] = "success" if overall_success else "failed"
         return overall_success, results
 
+    async def _run_fail_fast(self, labels: List[str], coros: List) -> Dict[str, Tuple[bool, Dict]]:
+        """任一模块失败即取消其余模块，返回已完成模块的结果"""
+        outcomes = {}
+
+        async def run_module(label, coro):
+            success, results = await coro
+            outcomes[label] = (success, results)
+            if not success:
+                raise ModuleFailedError(label)
+
+        if not coros:
+            return outcomes
+
+        tasks = [asyncio.ensure_future(run_module(label, coro)) for label, coro in zip(labels, coros)]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        errors = [task.exception() for task in done if task.exception() is not None]
+        for error in errors:
+            if not isinstance(error, ModuleFailedError):
+                raise error
+        if errors:
+            failed = ", ".join(str(e) for e in errors)
+            self.log(f"模块 {failed} 测试失败，已取消其余测试", "WARNING")
+
+        return outcomes
+
     async def run_all_tests(self, test_backend: bool = True,
                           test_frontend: bool = True,
                           test_database: bool = True,
-                          test_scripts: bool = True) -> Dict:
+                          test_scripts: bool = True,
+                          fail_fast: bool = False) -> Dict:
         """运行所有测试"""
         self.log("开始运行快速测试...")
 
@@ -300,26 +401,29 @@ class QuickTester:
             "overall_success": True
         }
 
-        # 运行各项测试
-        if test_backend:
-            success, results = await self.test_backend()
-            test_results["modules"]["backend"] = results
-            test_results["overall_success"] &= success
+        # 运行各项测试（各模块相互独立，并发执行）
+        labels = []
+        coros = []
+        for label, enabled, test_func in (
+            ("backend", test_backend, self.test_backend),
+            ("frontend", test_frontend, self.test_frontend),
+            ("database", test_database, self.test_database),
+            ("scripts", test_scripts, self.test_scripts),
+        ):
+            if enabled:
+                labels.append(label)
+                coros.append(test_func())
 
-        if test_frontend:
-            success, results = await self.test_frontend()
-            test_results["modules"]["frontend"] = results
-            test_results["overall_success"] &= success
-
-        if test_database:
-            success, results = await self.test_database()
-            test_results["modules"]["database"] = results
-            test_results["overall_success"] &= success
-
-        if test_scripts:
-            success, results = await self.test_scripts()
-            test_results["modules"]["scripts"] = results
-            test_results["overall_success"] &= success
+        try:
+            if fail_fast:
+                module_outcomes = await self._run_fail_fast(labels, coros)
+            else:
+                module_outcomes = dict(zip(labels, await asyncio.gather(*coros)))
+        finally:
+            await self.close()
+        for label, (_, results) in module_outcomes.items():
+            test_results["modules"][label] = results
+        test_results["overall_success"] = all(success for success, _ in module_outcomes.values())
 
         # 统计测试结果
         for module_name, module_results in test_results["modules"].items():
@@ -339,45 +443,59 @@ class QuickTester:
 
     def print_results(self, results: Dict):
         """打印测试结果"""
-        print("\n" + "="*60)
-        print("🧪 AutoSaaS Radar 快速测试结果")
-        print("="*60)
-
-        print(f"开始时间: {results['start_time']}")
-        print(f"结束时间: {results['end_time']}")
-        print(f"测试耗时: {results['duration_seconds']}秒")
-        print()
+        # 先拼接完整报告再一次性写出，避免逐行print反复加锁刷新
+        lines = [
+            "",
+            "=" * 60,
+            "🧪 AutoSaaS Radar 快速测试结果",
+            "=" * 60,
+            f"开始时间: {results['start_time']}",
+            f"结束时间: {results['end_time']}",
+            f"测试耗时: {results['duration_seconds']}秒",
+            "",
+        ]
 
         # 总体结果
         status_icon = "✅" if results["overall_success"] else "❌"
-        print(f"{status_icon} 总体状态: {'通过' if results['overall_success'] else '失败'}")
-        print(f"📊 测试统计: {results['passed_tests']}/{results['total_tests']} 通过")
-        print()
+        lines.append(f"{status_icon} 总体状态: {'通过' if results['overall_success'] else '失败'}")
+        lines.append(f"📊 测试统计: {results['passed_tests']}/{results['total_tests']} 通过")
+        lines.append("")
 
         # 各模块结果
         for module_name, module_results in results["modules"].items():
             status_icon = "✅" if module_results.get("overall_status") == "success" else "❌"
-            print(f"{status_icon} {module_results['name']}: {module_results['overall_status']}")
+            lines.append(f"{status_icon} {module_results['name']}: {module_results['overall_status']}")
 
             if "tests" in module_results:
                 for test_name, test_result in module_results["tests"].items():
                     test_icon = "✅" if test_result.get("success", False) else "❌"
-                    print(f"   {test_icon} {test_name}: {test_result['message']}")
-            print()
+                    lines.append(f"   {test_icon} {test_name}: {test_result['message']}")
+            lines.append("")
 
-        print("="*60)
+        lines.append("=" * 60)
 
         # 失败建议
         if not results["overall_success"]:
-            print("🚨 失败建议:")
-            print("1. 检查相关服务是否已启动")
-            print("2. 确认端口是否被占用")
-            print("3. 查看详细错误日志")
-            print("4. 检查环境变量配置")
-            print()
-
-    def save_results(self, results: Dict):
-        """保存测试结果"""
+            lines.extend([
+                "🚨 失败建议:",
+                "1. 检查相关服务是否已启动",
+                "2. 确认端口是否被占用",
+                "3. 查看详细错误日志",
+                "4. 检查环境变量配置",
+                "",
+            ])
+
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    @staticmethod
+    def dump_results(results: Dict) -> bytes:
+        """将测试结果序列化为JSON字节"""
+        if orjson:
+            return orjson.dumps(results, option=orjson.OPT_INDENT_2)
+        return json.dumps(results, ensure_ascii=False, indent=2).encode('utf-8')
+
+    def save_results(self, payload: bytes):
+        """保存已序列化的测试结果"""
         try:
             reports_dir = project_root / "reports"
             reports_dir.mkdir(exist_ok=True)
@@ -385,11 +503,12 @@ class QuickTester:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             report_file = reports_dir / f"quick_test_{timestamp}.json"
 
-            with open(report_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, ensure_ascii=False, indent=2)
+            report_file.write_bytes(payload)
 
             print(f"📄 测试结果已保存: {report_file}")
 
+            self._save_probe_cache()
+
         except Exception as e:
             print(f"❌ 保存测试结果失败: {e}")
 
@@ -403,6 +522,7 @@ async def main():
     parser.add_argument("--scripts", action="store_true", help="测试脚本功能")
     parser.add_argument("--all", action="store_true", help="测试所有模块")
     parser.add_argument("--verbose", "-v", action="store_true", help="详细输出")
+    parser.add_argument("--fail-fast", action="store_true", help="任一模块失败即停止其余测试")
 
     args = parser.parse_args()
 
@@ -417,11 +537,14 @@ async def main():
             test_backend=args.backend or args.all,
             test_frontend=args.frontend or args.all,
             test_database=args.database or args.all,
-            test_scripts=args.scripts or args.all
+            test_scripts=args.scripts or args.all,
+            fail_fast=args.fail_fast
         )
 
+        payload = tester.dump_results(results)
+
         tester.print_results(results)
-        tester.save_results(results)
+        tester.save_results(payload)
 
         sys.exit(0 if results["overall_success"] else 1)
 
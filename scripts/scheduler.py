@@ -6,18 +6,27 @@
 
 import asyncio
 import argparse
+import fcntl
+import hashlib
 import json
 import logging
+import os
 import signal
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 import schedule
 import psutil
 
+try:
+    import orjson
+except ImportError:  # 可选依赖，未安装时退回标准库json
+    orjson = None
+
 # 添加项目根目录到路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / "backend"))
@@ -37,6 +46,54 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# 清理临时文件的并发线程数
+CLEANUP_WORKERS = 16
+
+# 调度循环单次休眠上限（秒），作为兜底
+SCHEDULER_MAX_SLEEP = 60
+# 没有任何任务时的休眠时间（秒）
+SCHEDULER_IDLE_SLEEP = 3600
+
+
+def _parse_cron_field(field: str, upper: int) -> Tuple[Optional[int], List[int]]:
+    """解析cron单个字段，返回(步长, 取值列表)，'*'返回(1, [])"""
+    if field == "*":
+        return 1, []
+    if field.startswith("*/"):
+        step = int(field[2:])
+        if not 0 < step <= upper:
+            raise ValueError(f"步长超出范围: {field}")
+        return step, []
+
+    values = sorted({int(value) for value in field.split(",")})
+    if any(not 0 <= value <= upper for value in values):
+        raise ValueError(f"取值超出范围: {field}")
+    return None, values
+
+
+def parse_cron_schedule(expression: str) -> List[Tuple[int, str, Optional[str]]]:
+    """将cron表达式解析为schedule任务参数列表[(间隔, 单位, at时间)]"""
+    parts = expression.split()
+    if len(parts) != 5:
+        raise ValueError(f"cron表达式应包含5个字段: {expression}")
+
+    minute, hour, day, month, weekday = parts
+    if (day, month, weekday) != ("*", "*", "*"):
+        raise ValueError(f"暂不支持按日/月/星期调度: {expression}")
+
+    minute_step, minutes = _parse_cron_field(minute, 59)
+    hour_step, hours = _parse_cron_field(hour, 23)
+
+    if not minutes:
+        # 分钟为*或*/N时，只支持每N分钟执行
+        if hour != "*":
+            raise ValueError(f"不支持的cron表达式: {expression}")
+        return [(minute_step, "minutes", None)]
+
+    if hours:
+        return [(1, "days", f"{h:02d}:{m:02d}") for h in hours for m in minutes]
+    return [(hour_step, "hours", f":{m:02d}") for m in minutes]
+
 
 class TaskScheduler:
     """任务调度器"""
@@ -45,36 +102,41 @@ class TaskScheduler:
         self.running = False
         self.scheduler_pid_file = project_root / "tmp" / "scheduler.pid"
         self.status_file = project_root / "tmp" / "scheduler_status.json"
+        self._pid_fd: Optional[int] = None
+        self._status_cache: Optional[Dict] = None
+        self._last_status_hash: Optional[bytes] = None
 
         # 创建临时目录
         self.scheduler_pid_file.parent.mkdir(exist_ok=True)
 
+        # 长期复用的事件循环，保留扫描器的连接池和DNS缓存
+        # 首次使用时才创建，确保守护化之后创建的文件描述符不会被DaemonContext关闭
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
         self.scanner = DailyScanner()
         self.setup_schedule()
 
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """获取长期复用的事件循环，首次调用时创建"""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop
+
     def setup_schedule(self):
         """设置定时任务"""
         # 每日扫描任务
-        cron_parts = settings.CRON_SCHEDULE.split()
-        if len(cron_parts) == 5:
-            minute, hour, day, month, weekday = cron_parts
-
-            if hour != "*" and minute != "*":
-                # 每天固定时间
-                schedule.every().day.at(f"{hour}:{minute}").do(self._run_daily_scan)
-                logger.info(f"设置每日扫描任务: {hour}:{minute}")
-            elif hour == "*" and minute != "*":
-                # 每小时特定分钟
-                schedule.every().hour.at(f":{minute}").do(self._run_daily_scan)
-                logger.info(f"设置每小时扫描任务: 第{minute}分钟")
-            else:
-                # 默认每天上午9点
-                schedule.every().day.at("09:00").do(self._run_daily_scan)
-                logger.info("设置默认每日扫描任务: 09:00")
-        else:
-            # 默认设置
-            schedule.every().day.at("09:00").do(self._run_daily_scan)
-            logger.info("设置默认每日扫描任务: 09:00")
+        try:
+            scan_jobs = parse_cron_schedule(settings.CRON_SCHEDULE)
+        except ValueError as e:
+            logger.warning(f"CRON_SCHEDULE解析失败，使用默认时间09:00: {e}")
+            scan_jobs = [(1, "days", "09:00")]
+
+        for interval, unit, at_time in scan_jobs:
+            job = getattr(schedule.every(interval), unit)
+            if at_time:
+                job = job.at(at_time)
+            job.do(self._run_daily_scan)
+            logger.info(f"设置扫描任务: 每{interval} {unit}" + (f" {at_time}" if at_time else ""))
 
         # 每周日生成周报
         schedule.every().sunday.at("18:00").do(self._generate_weekly_report)
@@ -89,8 +151,7 @@ class TaskScheduler:
         logger.info("开始执行定时扫描任务")
 
         try:
-            # 在新进程中运行扫描，避免阻塞调度器
-            success = asyncio.run(self.scanner.run_scan())
+            success = self._get_loop().run_until_complete(self.scanner.run_scan())
 
             if success:
                 logger.info("定时扫描任务完成")
@@ -111,7 +172,7 @@ class TaskScheduler:
             from .weekly_report import WeeklyReportGenerator
 
             generator = WeeklyReportGenerator()
-            report_path = asyncio.run(generator.generate_report())
+            report_path = self._get_loop().run_until_complete(generator.generate_report())
 
             logger.info(f"周报生成完成: {report_path}")
             self._update_task_status("weekly_report", "success", datetime.now())
@@ -128,18 +189,13 @@ class TaskScheduler:
                 project_root / "logs"
             ]
 
-            cleaned_files = 0
-            cutoff_time = datetime.now() - timedelta(days=7)
+            cutoff_ts = (datetime.now() - timedelta(days=7)).timestamp()
 
-            for temp_dir in temp_dirs:
-                if temp_dir.exists():
-                    for file_path in temp_dir.glob("*"):
-                        if file_path.is_file():
-                            # 检查文件修改时间
-                            file_mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
-                            if file_mtime < cutoff_time:
-                                file_path.unlink()
-                                cleaned_files += 1
+            with ThreadPoolExecutor(max_workers=CLEANUP_WORKERS) as executor:
+                cleaned_files = sum(executor.map(
+                    lambda entry: self._delete_if_old(entry, cutoff_ts),
+                    self._iter_temp_files(temp_dirs)
+                ))
 
             if cleaned_files > 0:
                 logger.info(f"清理了 {cleaned_files} 个临时文件")
@@ -147,6 +203,28 @@ class TaskScheduler:
         except Exception as e:
             logger.error(f"清理临时文件失败: {e}")
 
+    @staticmethod
+    def _iter_temp_files(temp_dirs: List[Path]):
+        """遍历目录下的普通文件，scandir自带类型和stat缓存，省去额外系统调用"""
+        for temp_dir in temp_dirs:
+            try:
+                with os.scandir(temp_dir) as it:
+                    yield from (entry for entry in it if entry.is_file(follow_symlinks=False))
+            except FileNotFoundError:
+                continue
+
+    @staticmethod
+    def _delete_if_old(entry: os.DirEntry, cutoff_ts: float) -> bool:
+        """删除修改时间早于截止时间的文件"""
+        try:
+            if entry.stat(follow_symlinks=False).st_mtime < cutoff_ts:
+                os.unlink(entry.path)
+                return True
+        except FileNotFoundError:
+            # 文件已被其他进程删除
+            pass
+        return False
+
     def _update_task_status(self, task_name: str, status: str,
                           run_time: datetime, error: str = None):
         """更新任务状态"""
@@ -163,18 +241,40 @@ class TaskScheduler:
             }
             status_data["scheduler_updated"] = datetime.now().isoformat()
 
-            with open(self.status_file, 'w') as f:
-                json.dump(status_data, f, indent=2)
+            self._write_status(status_data)
 
         except Exception as e:
             logger.error(f"更新任务状态失败: {e}")
 
+    def _write_status(self, status_data: Dict):
+        """写入状态文件，内容未变化时跳过"""
+        # 更新时间每次都不同，不参与比较
+        content = {k: v for k, v in status_data.items() if k != "scheduler_updated"}
+        if orjson:
+            content_bytes = orjson.dumps(content, option=orjson.OPT_SORT_KEYS)
+            payload = orjson.dumps(status_data, option=orjson.OPT_INDENT_2)
+        else:
+            content_bytes = json.dumps(content, sort_keys=True).encode()
+            payload = json.dumps(status_data, indent=2).encode()
+
+        digest = hashlib.blake2b(content_bytes, digest_size=16).digest()
+        if digest == self._last_status_hash:
+            return
+
+        self.status_file.write_bytes(payload)
+        self._status_cache = status_data
+        self._last_status_hash = digest
+
     def _load_status(self) -> Dict:
-        """加载状态文件"""
+        """加载状态文件，首次读取后使用内存缓存"""
+        if self._status_cache is not None:
+            return self._status_cache
+
         try:
             if self.status_file.exists():
-                with open(self.status_file, 'r') as f:
-                    return json.load(f)
+                raw = self.status_file.read_bytes()
+                self._status_cache = orjson.loads(raw) if orjson else json.loads(raw)
+                return self._status_cache
         except Exception as e:
             logger.warning(f"加载状态文件失败: {e}")
 
@@ -183,25 +283,35 @@ class TaskScheduler:
             "tasks": {}
         }
 
+    def _acquire_pid_lock(self) -> bool:
+        """对PID文件加排他锁并写入PID，锁随进程退出自动释放"""
+        fd = os.open(self.scheduler_pid_file, os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        # 保持文件描述符打开，进程存活期间一直持有锁
+        self._pid_fd = fd
+        return True
+
     def start(self, daemon: bool = False):
         """启动调度器"""
-        if self.is_running():
+        if not self._acquire_pid_lock():
             logger.error("调度器已在运行")
             return False
 
         self.running = True
 
-        # 写入PID文件
-        with open(self.scheduler_pid_file, 'w') as f:
-            f.write(str(os.getpid()))
-
         # 更新状态
         status_data = self._load_status()
         status_data["scheduler_started"] = datetime.now().isoformat()
         status_data["scheduler_pid"] = os.getpid()
 
-        with open(self.status_file, 'w') as f:
-            json.dump(status_data, f, indent=2)
+        self._write_status(status_data)
 
         logger.info("调度器已启动")
 
@@ -245,15 +355,19 @@ class TaskScheduler:
             with open(self.scheduler_pid_file, 'r') as f:
                 pid = int(f.read().strip())
 
-            # 检查进程是否存在
-            return psutil.pid_exists(pid)
+            # 信号0只检查进程是否存在，不会真正发送信号
+            os.kill(pid, 0)
+            return True
 
+        except PermissionError:
+            # 进程存在但属于其他用户
+            return True
         except Exception:
             return False
 
     def get_status(self) -> Dict:
         """获取调度器状态"""
-        status_data = self._load_status()
+        status_data = dict(self._load_status())
 
         status_data.update({
             "is_running": self.is_running(),
@@ -264,6 +378,15 @@ class TaskScheduler:
 
         return status_data
 
+    @staticmethod
+    def _sleep_until_next_job():
+        """休眠到下一个任务到期，最长不超过SCHEDULER_MAX_SLEEP"""
+        idle_seconds = schedule.idle_seconds()
+        if idle_seconds is None:
+            time.sleep(SCHEDULER_IDLE_SLEEP)
+        elif idle_seconds > 0:
+            time.sleep(min(idle_seconds, SCHEDULER_MAX_SLEEP))
+
     def _run_foreground(self):
         """前台运行"""
         logger.info("调度器前台运行中...")
@@ -271,7 +394,7 @@ class TaskScheduler:
         try:
             while self.running:
                 schedule.run_pending()
-                time.sleep(60)  # 每分钟检查一次
+                self._sleep_until_next_job()
         except KeyboardInterrupt:
             logger.info("收到中断信号，停止调度器")
         finally:
@@ -283,11 +406,12 @@ class TaskScheduler:
 
         logger.info("调度器后台运行中...")
 
-        with daemon.DaemonContext():
+        # 保留PID文件描述符，避免守护化时关闭导致锁被释放
+        with daemon.DaemonContext(files_preserve=[self._pid_fd]):
             try:
                 while self.running:
                     schedule.run_pending()
-                    time.sleep(60)
+                    self._sleep_until_next_job()
             except Exception as e:
                 logger.error(f"调度器异常: {e}")
             finally:
@@ -297,9 +421,21 @@ class TaskScheduler:
         """清理资源"""
         self.running = False
 
+        try:
+            self._get_loop().run_until_complete(self.scanner.shutdown())
+        except Exception as e:
+            logger.warning(f"关闭扫描器数据库连接失败: {e}")
+        finally:
+            self._loop.close()
+            self._loop = None
+
         if self.scheduler_pid_file.exists():
             self.scheduler_pid_file.unlink()
 
+        if self._pid_fd is not None:
+            os.close(self._pid_fd)
+            self._pid_fd = None
+
         logger.info("调度器已清理")
 
 
@@ -1,75 +1,147 @@
 #!/usr/bin/env python3
 """
 环境变量设置脚本 - 快速配置开发和生产环境
-用法: python setup_env.py [--env=development|production|staging] [--interactive]
+用法: python setup_env.py [--env=development|production|staging] [--interactive] [--skip-vercel] [--skip-validate]
 """
 
 import argparse
 import json
 import os
+import shutil
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import ClassVar, Dict, Mapping, Optional, Tuple
 
 # 项目根目录
-project_root = Path(__file__).parent.parent
+_PROJECT_ROOT_STR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+project_root = Path(_PROJECT_ROOT_STR)
+
+# 写环境文件的缓冲区大小
+ENV_FILE_BUFFER_SIZE = 64 * 1024
+
+# 生成文件的头部
+_ENV_HEADER_TMPL = (
+    "# AutoSaaS Radar Environment Variables\n"
+    "# Environment: {env}\n"
+    "# Generated: {now}\n\n"
+)
+_ENV_EXAMPLE_HEADER = (
+    "# AutoSaaS Radar Environment Variables (Example)\n"
+    "# Copy this file to .env and fill in your values\n\n"
+)
+
+# 必需的配置项
+_REQUIRED_CONFIG_KEYS = frozenset({"OPENAI_API_KEY", "SUPABASE_URL", "SUPABASE_KEY"})
+
+# 配置格式校验规则: 键 -> (期望前缀, 警告信息)
+_CONFIG_FORMAT_RULES = {
+    "OPENAI_API_KEY": ("sk-", "OpenAI API Key 格式可能不正确"),
+    "SUPABASE_URL": ("https://", "Supabase URL 格式可能不正确"),
+}
+
+# 各环境公共的配置模板
+_BASE_TEMPLATE = {
+    "OPENAI_API_KEY": "",
+    "OPENAI_MODEL": "gpt-4o",
+    "SUPABASE_URL": "",
+    "SUPABASE_KEY": "",
+    "NEXT_PUBLIC_SUPABASE_URL": "",
+    "NEXT_PUBLIC_SUPABASE_ANON_KEY": "",
+    "REDDIT_CLIENT_ID": "",
+    "REDDIT_CLIENT_SECRET": "",
+    "DEBUG": "false",
+    "LOG_LEVEL": "INFO",
+    "CRON_SCHEDULE": "0 9 * * *",
+    "DATA_SOURCE_LIMIT": "50"
+}
+
+# 各环境相对公共模板的差异
+_TEMPLATE_OVERRIDES = {
+    "development": {
+        "OPENAI_API_KEY": "your-openai-api-key-here",
+        "SUPABASE_URL": "your-supabase-url-here",
+        "SUPABASE_KEY": "your-supabase-anon-key-here",
+        "NEXT_PUBLIC_SUPABASE_URL": "your-supabase-url-here",
+        "NEXT_PUBLIC_SUPABASE_ANON_KEY": "your-supabase-anon-key-here",
+        "DEBUG": "true",
+        "LOG_LEVEL": "DEBUG",
+        "DATA_SOURCE_LIMIT": "20"
+    },
+    "production": {},
+    "staging": {
+        "DEBUG": "true",
+        "LOG_LEVEL": "DEBUG",
+        "CRON_SCHEDULE": "0 */6 * * *",  # 每6小时
+        "DATA_SOURCE_LIMIT": "30"
+    }
+}
+
+
+def _write_lines(path: Path, lines):
+    """一次性写出环境文件内容，缓冲区足够容纳整个文件，中途不会刷新"""
+    with open(path, 'w', encoding='utf-8', buffering=ENV_FILE_BUFFER_SIZE) as f:
+        f.writelines(lines)
+
+
+def _vercel_key(key: str) -> str:
+    """Vercel 使用下划线命名，转换 NEXT_PUBLIC 变量"""
+    if key.startswith("NEXT_PUBLIC_"):
+        return key.lower().replace("_", "-")
+    return key
 
 
 class EnvironmentSetup:
     """环境配置管理器"""
 
-    def __init__(self):
-        self.templates = {
-            "development": {
-                "OPENAI_API_KEY": "your-openai-api-key-here",
-                "OPENAI_MODEL": "gpt-4o",
-                "SUPABASE_URL": "your-supabase-url-here",
-                "SUPABASE_KEY": "your-supabase-anon-key-here",
-                "NEXT_PUBLIC_SUPABASE_URL": "your-supabase-url-here",
-                "NEXT_PUBLIC_SUPABASE_ANON_KEY": "your-supabase-anon-key-here",
-                "REDDIT_CLIENT_ID": "",
-                "REDDIT_CLIENT_SECRET": "",
-                "DEBUG": "true",
-                "LOG_LEVEL": "DEBUG",
-                "CRON_SCHEDULE": "0 9 * * *",
-                "DATA_SOURCE_LIMIT": "20"
-            },
-            "production": {
-                "OPENAI_API_KEY": "",
-                "OPENAI_MODEL": "gpt-4o",
-                "SUPABASE_URL": "",
-                "SUPABASE_KEY": "",
-                "NEXT_PUBLIC_SUPABASE_URL": "",
-                "NEXT_PUBLIC_SUPABASE_ANON_KEY": "",
-                "REDDIT_CLIENT_ID": "",
-                "REDDIT_CLIENT_SECRET": "",
-                "DEBUG": "false",
-                "LOG_LEVEL": "INFO",
-                "CRON_SCHEDULE": "0 9 * * *",
-                "DATA_SOURCE_LIMIT": "50"
-            },
-            "staging": {
-                "OPENAI_API_KEY": "",
-                "OPENAI_MODEL": "gpt-4o",
-                "SUPABASE_URL": "",
-                "SUPABASE_KEY": "",
-                "NEXT_PUBLIC_SUPABASE_URL": "",
-                "NEXT_PUBLIC_SUPABASE_ANON_KEY": "",
-                "REDDIT_CLIENT_ID": "",
-                "REDDIT_CLIENT_SECRET": "",
-                "DEBUG": "true",
-                "LOG_LEVEL": "DEBUG",
-                "CRON_SCHEDULE": "0 */6 * * *",  # 每6小时
-                "DATA_SOURCE_LIMIT": "30"
-            }
-        }
-
-    def setup_environment(self, env: str, interactive: bool = False) -> bool:
+    # 各环境的完整模板，由公共配置与环境差异合并而成，类定义时构建一次
+    # 合并后的值直接引用公共模板中的字符串对象；只读视图防止被意外修改
+    TEMPLATES: ClassVar[Mapping[str, Mapping[str, str]]] = MappingProxyType({
+        env: MappingProxyType({**_BASE_TEMPLATE, **overrides})
+        for env, overrides in _TEMPLATE_OVERRIDES.items()
+    })
+
+    # 交互式设置的配置项：先必需项，后可选项
+    _INTERACTIVE_CONFIGS: ClassVar[Tuple[Mapping[str, object], ...]] = (
+        MappingProxyType({
+            "key": "OPENAI_API_KEY",
+            "prompt": "OpenAI API Key",
+            "required": True,
+            "example": "sk-..."
+        }),
+        MappingProxyType({
+            "key": "SUPABASE_URL",
+            "prompt": "Supabase URL",
+            "required": True,
+            "example": "https://your-project.supabase.co"
+        }),
+        MappingProxyType({
+            "key": "SUPABASE_KEY",
+            "prompt": "Supabase Anonymous Key",
+            "required": True,
+            "example": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9..."
+        }),
+        MappingProxyType({
+            "key": "REDDIT_CLIENT_ID",
+            "prompt": "Reddit Client ID (可选)",
+            "required": False
+        }),
+        MappingProxyType({
+            "key": "REDDIT_CLIENT_SECRET",
+            "prompt": "Reddit Client Secret (可选)",
+            "required": False
+        }),
+    )
+
+    def setup_environment(self, env: str, interactive: bool = False,
+                          skip_vercel: bool = False, skip_validate: bool = False) -> bool:
         """设置环境变量"""
         print(f"🚀 开始设置 {env} 环境...")
 
         # 获取环境模板
-        template = self.templates.get(env)
+        template = self.TEMPLATES.get(env)
         if not template:
             print(f"❌ 不支持的环境: {env}")
             return False
@@ -78,7 +150,7 @@ class EnvironmentSetup:
         env_vars = template.copy()
 
         if interactive:
-            env_vars = self._interactive_setup(env_vars)
+            self._interactive_setup(env_vars)
 
         # 创建 .env 文件
         env_file = project_root / ".env"
@@ -86,38 +158,37 @@ class EnvironmentSetup:
 
         # 备份现有 .env 文件
         if env_file.exists():
-            backup_file = project_root / f".env.backup.{int(time.time())}"
-            env_file.rename(backup_file)
+            # 纳秒时间戳避免同一秒内重复运行时备份文件名冲突
+            backup_file = project_root / f".env.backup.{time.time_ns()}"
+            try:
+                os.replace(env_file, backup_file)
+            except OSError:
+                # 跨设备等情况下无法原子替换，退回复制后删除
+                shutil.move(str(env_file), str(backup_file))
             print(f"📁 现有 .env 文件已备份为: {backup_file}")
 
         # 写入 .env 文件
         try:
-            with open(env_file, 'w', encoding='utf-8') as f:
-                f.write(f"# AutoSaaS Radar Environment Variables\n")
-                f.write(f"# Environment: {env}\n")
-                f.write(f"# Generated: {datetime.now().isoformat()}\n\n")
-
-                for key, value in env_vars.items():
-                    f.write(f"{key}={value}\n")
+            lines = [_ENV_HEADER_TMPL.format(env=env, now=datetime.now().isoformat())]
+            lines.extend(f"{key}={value}\n" for key, value in env_vars.items())
+            _write_lines(env_file, lines)
 
             print(f"✅ .env 文件已创建: {env_file}")
 
             # 更新 .env.example
-            with open(env_example_file, 'w', encoding='utf-8') as f:
-                f.write(f"# AutoSaaS Radar Environment Variables (Example)\n")
-                f.write(f"# Copy this file to .env and fill in your values\n\n")
-
-                for key, value in template.items():
-                    example_value = "your-value-here" if not value else value
-                    f.write(f"{key}={example_value}\n")
+            lines = [_ENV_EXAMPLE_HEADER]
+            lines.extend(f"{key}={value or 'your-value-here'}\n" for key, value in template.items())
+            _write_lines(env_example_file, lines)
 
             print(f"✅ .env.example 文件已更新: {env_example_file}")
 
             # 设置 Vercel 环境变量
-            self._setup_vercel_env(env_vars, env)
+            if not skip_vercel:
+                self._setup_vercel_env(env_vars, env)
 
             # 验证配置
-            self._validate_config(env_vars, env)
+            if not skip_validate:
+                self._validate_config(env_vars, env)
 
             return True
 
@@ -125,53 +196,11 @@ class EnvironmentSetup:
             print(f"❌ 创建环境文件失败: {e}")
             return False
 
-    def _interactive_setup(self, template: Dict) -> Dict:
-        """交互式设置"""
-        import time
-
+    def _interactive_setup(self, env_vars: Dict) -> None:
+        """交互式设置，直接更新传入的环境变量字典"""
         print("\n📝 交互式环境配置 (按 Enter 使用默认值):")
 
-        env_vars = template.copy()
-
-        # 必需的配置项
-        required_configs = [
-            {
-                "key": "OPENAI_API_KEY",
-                "prompt": "OpenAI API Key",
-                "required": True,
-                "example": "sk-..."
-            },
-            {
-                "key": "SUPABASE_URL",
-                "prompt": "Supabase URL",
-                "required": True,
-                "example": "https://your-project.supabase.co"
-            },
-            {
-                "key": "SUPABASE_KEY",
-                "prompt": "Supabase Anonymous Key",
-                "required": True,
-                "example": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9..."
-            }
-        ]
-
-        # 可选的配置项
-        optional_configs = [
-            {
-                "key": "REDDIT_CLIENT_ID",
-                "prompt": "Reddit Client ID (可选)",
-                "required": False
-            },
-            {
-                "key": "REDDIT_CLIENT_SECRET",
-                "prompt": "Reddit Client Secret (可选)",
-                "required": False
-            }
-        ]
-
-        all_configs = required_configs + optional_configs
-
-        for config in all_configs:
+        for config in self._INTERACTIVE_CONFIGS:
             key = config["key"]
             prompt = config["prompt"]
             required = config["required"]
@@ -187,8 +216,6 @@ class EnvironmentSetup:
             elif required and not current_value:
                 print(f"    ⚠️  {key} 是必需的，请确保稍后手动设置")
 
-        return env_vars
-
     def _setup_vercel_env(self, env_vars: Dict, env: str):
         """设置 Vercel 环境变量"""
         try:
@@ -197,26 +224,23 @@ class EnvironmentSetup:
             # 创建 Vercel 环境变量文件
             vercel_env_file = project_root / "deploy" / "vercel.env"
 
-            with open(vercel_env_file, 'w', encoding='utf-8') as f:
-                f.write("# Vercel Environment Variables\n")
-                f.write(f"# Environment: {env}\n\n")
-
-                for key, value in env_vars.items():
-                    # Vercel 使用下划线命名，转换 NEXT_PUBLIC 变量
-                    vercel_key = key
-                    if key.startswith("NEXT_PUBLIC_"):
-                        vercel_key = key.lower().replace("_", "-")
-
-                    f.write(f"{vercel_key}={value}\n")
+            _write_lines(vercel_env_file, [
+                "# Vercel Environment Variables\n",
+                f"# Environment: {env}\n\n",
+                *(f"{_vercel_key(key)}={value}\n" for key, value in env_vars.items())
+            ])
 
             print(f"✅ Vercel 环境变量文件已创建: {vercel_env_file}")
 
             # 提供设置命令
+            cmds = [
+                f"  vercel env add {key.lower().replace('_', '-')} {env}"
+                for key, value in env_vars.items()
+                if value and not value.startswith("your-")
+            ]
             print("\n📋 Vercel 环境变量设置命令:")
-            for key, value in env_vars.items():
-                if value and not value.startswith("your-"):
-                    vercel_key = key.lower().replace("_", "-")
-                    print(f"  vercel env add {vercel_key} {env}")
+            if cmds:
+                sys.stdout.write("\n".join(cmds) + "\n")
 
         except Exception as e:
             print(f"⚠️  设置 Vercel 环境变量失败: {e}")
@@ -227,33 +251,36 @@ class EnvironmentSetup:
 
         warnings = []
 
-        # 检查必需的配置项
-        required_keys = ["OPENAI_API_KEY", "SUPABASE_URL", "SUPABASE_KEY"]
-        for key in required_keys:
-            value = env_vars.get(key, "")
-            if not value or value.startswith("your-"):
+        # 一次遍历同时检查必需项和格式
+        for key, value in env_vars.items():
+            if key in _REQUIRED_CONFIG_KEYS and (not value or value.startswith("your-")):
                 warnings.append(f"缺少必需的配置: {key}")
 
-        # 检查格式
-        if env_vars.get("OPENAI_API_KEY", "") and not env_vars["OPENAI_API_KEY"].startswith("sk-"):
-            warnings.append("OpenAI API Key 格式可能不正确")
+            rule = _CONFIG_FORMAT_RULES.get(key)
+            if rule and value and not value.startswith(rule[0]):
+                warnings.append(rule[1])
 
-        if env_vars.get("SUPABASE_URL", "") and not env_vars["SUPABASE_URL"].startswith("https://"):
-            warnings.append("Supabase URL 格式可能不正确")
+        warnings.extend(
+            f"缺少必需的配置: {key}" for key in sorted(_REQUIRED_CONFIG_KEYS.difference(env_vars))
+        )
 
         # 输出验证结果
         if warnings:
-            print("⚠️  配置警告:")
-            for warning in warnings:
-                print(f"   - {warning}")
+            print("⚠️  配置警告:\n" + "\n".join(f"   - {warning}" for warning in warnings))
         else:
             print("✅ 配置验证通过")
 
-        print("\n📋 配置摘要:")
-        print(f"   - 环境: {env}")
-        print(f"   - 调试模式: {env_vars.get('DEBUG', 'false')}")
-        print(f"   - 日志级别: {env_vars.get('LOG_LEVEL', 'INFO')}")
-        print(f"   - 数据源限制: {env_vars.get('DATA_SOURCE_LIMIT', '50')}")
+        debug = env_vars.get("DEBUG", "false")
+        log_level = env_vars.get("LOG_LEVEL", "INFO")
+        data_source_limit = env_vars.get("DATA_SOURCE_LIMIT", "50")
+
+        print(
+            "\n📋 配置摘要:\n"
+            f"   - 环境: {env}\n"
+            f"   - 调试模式: {debug}\n"
+            f"   - 日志级别: {log_level}\n"
+            f"   - 数据源限制: {data_source_limit}"
+        )
 
     def create_docker_env(self, env: str):
         """创建 Docker 环境文件"""
@@ -261,12 +288,11 @@ class EnvironmentSetup:
             docker_env_file = project_root / "docker" / ".env"
             docker_env_file.parent.mkdir(exist_ok=True)
 
-            template = self.templates.get(env, self.templates["production"])
+            template = self.TEMPLATES.get(env, self.TEMPLATES["production"])
 
-            with open(docker_env_file, 'w', encoding='utf-8') as f:
-                f.write("# Docker Environment Variables\n")
-                for key, value in template.items():
-                    f.write(f"{key}={value}\n")
+            lines = ["# Docker Environment Variables\n"]
+            lines.extend(f"{key}={value}\n" for key, value in template.items())
+            _write_lines(docker_env_file, lines)
 
             print(f"✅ Docker 环境文件已创建: {docker_env_file}")
 
@@ -283,17 +309,20 @@ def main():
                        help="交互式设置")
     parser.add_argument("--docker", action="store_true",
                        help="同时创建 Docker 环境文件")
+    parser.add_argument("--skip-vercel", action="store_true",
+                       help="跳过生成 Vercel 环境变量文件")
+    parser.add_argument("--skip-validate", action="store_true",
+                       help="跳过配置验证")
 
     args = parser.parse_args()
 
-    # 导入时间模块
-    from datetime import datetime
-    import time
-
     setup = EnvironmentSetup()
 
     try:
-        success = setup.setup_environment(args.env, args.interactive)
+        success = setup.setup_environment(
+            args.env, args.interactive,
+            skip_vercel=args.skip_vercel, skip_validate=args.skip_validate
+        )
 
         if success and args.docker:
             setup.create_docker_env(args.env)
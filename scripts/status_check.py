@@ -7,17 +7,41 @@
 import os
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+# 项目根目录
+_PROJECT_ROOT_STR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 class ProjectStatusChecker:
     def __init__(self):
-        self.project_root = Path(__file__).parent.parent
+        self.project_root = Path(_PROJECT_ROOT_STR)
         self.results = {}
 
+    @staticmethod
+    def _index_dir(base: str, files):
+        """对候选文件所在的每个目录各scandir一次，返回已存在文件的相对路径集合"""
+        present = set()
+        for subdir in {os.path.dirname(f) for f in files}:
+            try:
+                with os.scandir(os.path.join(base, subdir)) as it:
+                    present.update(
+                        f"{subdir}/{entry.name}" if subdir else entry.name
+                        for entry in it if entry.is_file()
+                    )
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+        return present
+
+    def _missing_files(self, base: str, files):
+        """返回base目录下不存在的文件列表"""
+        present = self._index_dir(base, files)
+        return [f for f in files if f not in present]
+
     def check_backend_modules(self):
         """检查后端模块完成状态"""
-        backend_path = self.project_root / "backend"
+        backend_path = os.path.join(_PROJECT_ROOT_STR, "backend")
 
         # 窗口2: RSS抓取模块
         rss_files = [
@@ -60,17 +84,24 @@ class ProjectStatusChecker:
             "API接口": api_files
         }
 
+        # 所有模块共用一份目录索引，重叠目录只扫描一次
+        backend_index = self._index_dir(backend_path, [f for files in modules.values() for f in files])
+
+        results = {}
         for module_name, files in modules.items():
-            completed = all((backend_path / f).exists() for f in files)
-            self.results[module_name] = {
+            missing_files = [f for f in files if f not in backend_index]
+            completed = not missing_files
+            results[module_name] = {
                 "status": "✅ 完成" if completed else "🟡 进行中",
                 "files": files,
+                "missing_files": missing_files,
                 "completed": completed
             }
+        return results
 
     def check_frontend_modules(self):
         """检查前端模块完成状态"""
-        frontend_path = self.project_root / "frontend"
+        frontend_path = os.path.join(_PROJECT_ROOT_STR, "frontend")
 
         # 检查关键文件
         key_files = [
@@ -81,20 +112,16 @@ class ProjectStatusChecker:
             "styles/globals.css"
         ]
 
-        completed_files = []
-        missing_files = []
-
-        for file in key_files:
-            if (frontend_path / file).exists():
-                completed_files.append(file)
-            else:
-                missing_files.append(file)
+        missing_files = self._missing_files(frontend_path, key_files)
+        completed_files = [f for f in key_files if f not in missing_files]
 
-        self.results["前端模块"] = {
-            "status": "✅ 完成" if len(missing_files) == 0 else "🟡 进行中",
-            "completed_files": completed_files,
-            "missing_files": missing_files,
-            "completed": len(missing_files) == 0
+        return {
+            "前端模块": {
+                "status": "✅ 完成" if len(missing_files) == 0 else "🟡 进行中",
+                "completed_files": completed_files,
+                "missing_files": missing_files,
+                "completed": len(missing_files) == 0
+            }
         }
 
     def check_deployment_files(self):
@@ -107,63 +134,81 @@ class ProjectStatusChecker:
             "Makefile"
         ]
 
-        completed = all((self.project_root / f).exists() for f in deploy_files)
-        self.results["部署自动化"] = {
-            "status": "✅ 完成" if completed else "🟡 进行中",
-            "files": deploy_files,
-            "completed": completed
+        missing_files = self._missing_files(_PROJECT_ROOT_STR, deploy_files)
+        completed = not missing_files
+        return {
+            "部署自动化": {
+                "status": "✅ 完成" if completed else "🟡 进行中",
+                "files": deploy_files,
+                "missing_files": missing_files,
+                "completed": completed
+            }
         }
 
+    def run_all_checks(self):
+        """并行执行各项检查，按固定顺序合并结果"""
+        checks = [
+            self.check_backend_modules,
+            self.check_frontend_modules,
+            self.check_deployment_files
+        ]
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            for results in executor.map(lambda check: check(), checks):
+                self.results.update(results)
+
     def generate_status_report(self):
         """生成状态报告"""
-        print("🚀 AutoSaaS Radar - 30分钟进度检查报告")
-        print("=" * 50)
-        print(f"⏰ 检查时间: {datetime.now().strftime('%H:%M:%S')}")
-        print()
+        parts = [
+            "🚀 AutoSaaS Radar - 30分钟进度检查报告",
+            "=" * 50,
+            f"⏰ 检查时间: {datetime.now().strftime('%H:%M:%S')}",
+            "",
+        ]
 
         total_modules = len(self.results)
         completed_modules = sum(1 for r in self.results.values() if r["completed"])
         progress_percentage = (completed_modules / total_modules) * 100
 
         for module_name, info in self.results.items():
-            print(f"📦 {module_name}: {info['status']}")
-            if not info["completed"] and "missing_files" in info:
-                print(f"   缺失文件: {', '.join(info['missing_files'])}")
-            elif not info["completed"] and "files" in info:
-                missing = [f for f in info["files"] if not (self.project_root / "backend" / f).exists()]
-                if missing:
-                    print(f"   缺失文件: {', '.join(missing)}")
-
-        print()
-        print("📊 总体进度:")
-        print(f"   完成模块: {completed_modules}/{total_modules}")
-        print(f"   进度百分比: {progress_percentage:.1f}%")
+            parts.append(f"📦 {module_name}: {info['status']}")
+            if not info["completed"] and info["missing_files"]:
+                parts.append(f"   缺失文件: {', '.join(info['missing_files'])}")
+
+        parts.extend([
+            "",
+            "📊 总体进度:",
+            f"   完成模块: {completed_modules}/{total_modules}",
+            f"   进度百分比: {progress_percentage:.1f}%",
+        ])
 
         if progress_percentage >= 80:
-            print("   状态: 🟢 优秀，可进入集成测试阶段")
+            parts.append("   状态: 🟢 优秀，可进入集成测试阶段")
         elif progress_percentage >= 60:
-            print("   状态: 🟡 良好，继续开发核心功能")
+            parts.append("   状态: 🟡 良好，继续开发核心功能")
         else:
-            print("   状态: 🔴 需要加快开发进度")
+            parts.append("   状态: 🔴 需要加快开发进度")
 
-        print()
-        print("🎯 下一步行动:")
+        parts.extend(["", "🎯 下一步行动:"])
         if progress_percentage >= 80:
-            print("   1. 运行集成测试")
-            print("   2. 验证数据流完整性")
-            print("   3. 准备部署")
+            parts.extend([
+                "   1. 运行集成测试",
+                "   2. 验证数据流完整性",
+                "   3. 准备部署",
+            ])
         else:
-            print("   1. 优先完成未完成模块")
-            print("   2. 确保API接口正常")
-            print("   3. 前端页面功能验证")
+            parts.extend([
+                "   1. 优先完成未完成模块",
+                "   2. 确保API接口正常",
+                "   3. 前端页面功能验证",
+            ])
+
+        sys.stdout.write("\n".join(parts) + "\n")
 
 if __name__ == "__main__":
     checker = ProjectStatusChecker()
 
     print("🔍 检查项目状态...")
-    checker.check_backend_modules()
-    checker.check_frontend_modules()
-    checker.check_deployment_files()
+    checker.run_all_checks()
 
     print()
     checker.generate_status_report()
\ No newline at end of file